@@ -13,6 +13,9 @@ import type { ModelWeights } from './model';
  *     ...
  *   ]
  * }
+ * Layers exported with `--quant int8` are dequantized on load:
+ *   { "quant": "per_row_int8", "weights_q8": [[...], ...], "scales": [...], "biases": [...] }
+ * with weights[j][k] = weights_q8[j][k] * scales[j].
  */
 export function parseModelWeights(json: unknown): ModelWeights {
   const obj = json as Record<string, unknown>;
@@ -21,6 +24,16 @@ export function parseModelWeights(json: unknown): ModelWeights {
   }
 
   const layers = (obj.layers as Record<string, unknown>[]).map((layer, i) => {
+    if (layer.quant === 'per_row_int8') {
+      if (!Array.isArray(layer.weights_q8) || !Array.isArray(layer.scales) || !Array.isArray(layer.biases)) {
+        throw new Error(`Invalid layer ${i}: missing weights_q8, scales or biases`);
+      }
+      const scales = layer.scales as number[];
+      return {
+        weights: (layer.weights_q8 as number[][]).map((row, j) => row.map((q) => q * scales[j])),
+        biases: layer.biases as number[],
+      };
+    }
     if (!Array.isArray(layer.weights) || !Array.isArray(layer.biases)) {
       throw new Error(`Invalid layer ${i}: missing weights or biases`);
     }
@@ -0,0 +1,38 @@
+import { describe, it, expect } from 'vitest';
+import { parseModelWeights } from '@ai/neural/weights-io';
+
+describe('parseModelWeights', () => {
+  it('passes full-precision layers through unchanged', () => {
+    const layer = { weights: [[0.5, -1.25], [2, 0]], biases: [0.1, -0.2] };
+    const { layers } = parseModelWeights({ layers: [layer] });
+    expect(layers[0].weights).toEqual(layer.weights);
+    expect(layers[0].biases).toEqual(layer.biases);
+  });
+
+  it('dequantizes per_row_int8 layers to weights_q8 * scales', () => {
+    const weightsQ8 = [[127, -64, 0], [-127, 3, 90]];
+    const scales = [0.0125, 0.002];
+    const biases = [0.25, -0.5];
+    const { layers } = parseModelWeights({
+      layers: [{ quant: 'per_row_int8', weights_q8: weightsQ8, scales, biases }],
+    });
+
+    const { weights } = layers[0];
+    expect(weights).toHaveLength(2);
+    weightsQ8.forEach((row, j) => {
+      expect(weights[j]).toHaveLength(row.length);
+      row.forEach((q, k) => {
+        expect(weights[j][k]).toBeCloseTo(q * scales[j], 12);
+      });
+    });
+    expect(layers[0].biases).toEqual(biases);
+  });
+
+  it('rejects a per_row_int8 layer without scales', () => {
+    expect(() =>
+      parseModelWeights({
+        layers: [{ quant: 'per_row_int8', weights_q8: [[1]], biases: [0] }],
+      }),
+    ).toThrow('Invalid layer 0');
+  });
+});
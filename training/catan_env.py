@@ -8,22 +8,29 @@ produces equivalent vectors.  Standalone -- no imports from the TS project.
 from __future__ import annotations
 
 import math
-from dataclasses import dataclass, field
+from functools import lru_cache
+from dataclasses import dataclass, field, fields
 from typing import (
+    Callable,
     Dict,
     List,
     Optional,
     Set,
     Tuple,
+    Union,
 )
 
 import numpy as np
 
+from numba_compat import HAS_NUMBA, njit
+
 # ──────────────────────────────────────────────────────────────────────
 #  Constants
 # ──────────────────────────────────────────────────────────────────────
 
 RESOURCES: List[str] = ["lumber", "brick", "wool", "grain", "ore"]
+NUM_RESOURCES = len(RESOURCES)
+RESOURCE_IDX: Dict[str, int] = {r: i for i, r in enumerate(RESOURCES)}
 
 TERRAIN_TYPES: List[str] = [
     "forest", "hills", "pasture", "fields", "mountains", "desert",
@@ -51,6 +58,10 @@ NUMBER_TOKEN_DISTRIBUTION: List[int] = [
     12,
 ]
 
+DEV_CARD_TYPES: List[str] = [
+    "knight", "road_building", "year_of_plenty", "monopoly", "victory_point",
+]
+
 DEV_CARD_DISTRIBUTION: List[str] = (
     ["knight"] * 14
     + ["victory_point"] * 5
@@ -59,6 +70,20 @@ DEV_CARD_DISTRIBUTION: List[str] = (
     + ["monopoly"] * 2
 )
 
+NUM_DEV_CARD_TYPES = len(DEV_CARD_TYPES)
+DEV_CARD_IDX: Dict[str, int] = {c: i for i, c in enumerate(DEV_CARD_TYPES)}
+KNIGHT_ID = DEV_CARD_IDX["knight"]
+ROAD_BUILDING_ID = DEV_CARD_IDX["road_building"]
+YEAR_OF_PLENTY_ID = DEV_CARD_IDX["year_of_plenty"]
+MONOPOLY_ID = DEV_CARD_IDX["monopoly"]
+VICTORY_POINT_ID = DEV_CARD_IDX["victory_point"]
+
+# Dice faces drawn per refill of CatanEnv's roll buffer (two per roll)
+_DICE_BUFFER_SIZE = 8192
+
+# Unshuffled deck as DEV_CARD_TYPES ids
+_DEV_DECK_TEMPLATE = np.array([DEV_CARD_IDX[c] for c in DEV_CARD_DISTRIBUTION], dtype=np.int8)
+
 TERRAIN_TO_RESOURCE: Dict[str, Optional[str]] = {
     "forest": "lumber",
     "hills": "brick",
@@ -68,17 +93,65 @@ TERRAIN_TO_RESOURCE: Dict[str, Optional[str]] = {
     "desert": None,
 }
 
-# Building costs: {resource: amount}
+# Boards store terrains as int8 ids into TERRAIN_TYPES
+TERRAIN_IDX: Dict[str, int] = {t: i for i, t in enumerate(TERRAIN_TYPES)}
+DESERT_ID = TERRAIN_IDX["desert"]
+
+# [terrain id] -> resource index, -1 for desert
+TERRAIN_TO_RESOURCE_ID = np.array(
+    [RESOURCE_IDX[TERRAIN_TO_RESOURCE[t]] if TERRAIN_TO_RESOURCE[t] is not None else -1
+     for t in TERRAIN_TYPES],
+    dtype=np.int8,
+)
+
+# Building costs: {resource: amount}. Each has an unrolled ``hand >= cost``
+# test next to it that takes a hand as a list in RESOURCES order and checks
+# only the non-zero entries (far cheaper than a NumPy compare on 5 elements).
 ROAD_COST: Dict[str, int] = {"lumber": 1, "brick": 1, "wool": 0, "grain": 0, "ore": 0}
+
+
+def _can_afford_road(h: List[int]) -> bool:
+    return h[0] >= 1 and h[1] >= 1
+
+
 SETTLEMENT_COST: Dict[str, int] = {"lumber": 1, "brick": 1, "wool": 1, "grain": 1, "ore": 0}
+
+
+def _can_afford_settlement(h: List[int]) -> bool:
+    return h[0] >= 1 and h[1] >= 1 and h[2] >= 1 and h[3] >= 1
+
+
 CITY_COST: Dict[str, int] = {"lumber": 0, "brick": 0, "wool": 0, "grain": 2, "ore": 3}
+
+
+def _can_afford_city(h: List[int]) -> bool:
+    return h[3] >= 2 and h[4] >= 3
+
+
 DEV_CARD_COST: Dict[str, int] = {"lumber": 0, "brick": 0, "wool": 1, "grain": 1, "ore": 1}
 
+
+def _can_afford_dev_card(h: List[int]) -> bool:
+    return h[2] >= 1 and h[3] >= 1 and h[4] >= 1
+
+
+# Same costs as int8 vectors in RESOURCES order (used by the hand arithmetic)
+ROAD_COST_ARR = np.array([ROAD_COST[r] for r in RESOURCES], dtype=np.int8)
+SETTLEMENT_COST_ARR = np.array([SETTLEMENT_COST[r] for r in RESOURCES], dtype=np.int8)
+CITY_COST_ARR = np.array([CITY_COST[r] for r in RESOURCES], dtype=np.int8)
+DEV_CARD_COST_ARR = np.array([DEV_CARD_COST[r] for r in RESOURCES], dtype=np.int8)
+
 MAX_SETTLEMENTS = 5
 MAX_CITIES = 4
 MAX_ROADS = 15
 BANK_PER_RESOURCE = 19
 
+# vertex_building_type codes (a building's code is also its production multiplier)
+BUILDING_NONE = 0
+BUILDING_SETTLEMENT = 1
+BUILDING_CITY = 2
+NO_OWNER = -1
+
 VP_TO_WIN = 10
 MIN_LONGEST_ROAD = 5
 MIN_LARGEST_ARMY = 3
@@ -141,15 +214,38 @@ def hex_corners(cx: float, cy: float, size: float = HEX_SIZE) -> List[Tuple[floa
     return [hex_corner(cx, cy, size, i) for i in range(6)]
 
 
-def points_equal(a: Tuple[float, float], b: Tuple[float, float], eps: float = 0.01) -> bool:
-    return abs(a[0] - b[0]) < eps and abs(a[1] - b[1]) < eps
+_SQRT3 = math.sqrt(3)
+_CORNER_ANGLES = np.deg2rad(np.arange(6) * 60.0 - 30.0)
+_CORNER_UNIT = np.stack([np.cos(_CORNER_ANGLES), np.sin(_CORNER_ANGLES)], axis=1)  # (6, 2)
+
+
+def hex_to_pixel_array(hex_positions: List[Tuple[int, int]], size: float = HEX_SIZE) -> np.ndarray:
+    """Vectorized hex_to_pixel: (H, 2) array of pixel centers."""
+    qr = np.asarray(hex_positions, dtype=np.float64).reshape(-1, 2)
+    x = size * (_SQRT3 * qr[:, 0] + (_SQRT3 / 2) * qr[:, 1])
+    y = size * (1.5 * qr[:, 1])
+    return np.stack([x, y], axis=1)
+
+
+def hex_corners_array(centers: np.ndarray, size: float = HEX_SIZE) -> np.ndarray:
+    """Vectorized hex_corners: (H, 6, 2) array of corner positions."""
+    return centers[:, None, :] + size * _CORNER_UNIT[None, :, :]
+
+
+# Pixel coordinates are snapped to a 1/1024 grid to get exact vertex keys
+_QUANT_SCALE = 1024
+
+
+def _quantize(points: np.ndarray) -> np.ndarray:
+    """Snap (..., 2) pixel coordinates to integer grid keys."""
+    return np.rint(points * _QUANT_SCALE).astype(np.int64)
 
 
 # ──────────────────────────────────────────────────────────────────────
 #  Board topology
 # ──────────────────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class BoardTopology:
     """Pre-computed adjacency tables matching the TS BoardTopology."""
 
@@ -168,35 +264,114 @@ class BoardTopology:
     hex_vertices: List[List[int]]                    # [hid] -> 6 vids
     hex_edges: List[List[int]]                       # [hid] -> 6 eids
 
+    # Coastal edges (eid, v1, v2) sorted by angle around the board center
+    coastal_edges_sorted: List[Tuple[int, int, int]] = field(default_factory=list)
+
+    # edge_endpoints split into parallel tuples (cheap unpacking in hot loops)
+    edge_v1: Tuple[int, ...] = ()                    # [eid] -> v1
+    edge_v2: Tuple[int, ...] = ()                    # [eid] -> v2
+
+    # CSR (indices, offsets) int32 copies of the adjacency tables, for
+    # array/JIT consumers: neighbours of i are indices[offsets[i]:offsets[i+1]]
+    vae_indices: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int32))  # vertex -> edges
+    vae_offsets: np.ndarray = field(default_factory=lambda: np.zeros(1, np.int32))
+    vav_indices: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int32))  # vertex -> vertices
+    vav_offsets: np.ndarray = field(default_factory=lambda: np.zeros(1, np.int32))
+    vah_indices: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int32))  # vertex -> hexes
+    vah_offsets: np.ndarray = field(default_factory=lambda: np.zeros(1, np.int32))
+    hv_indices: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int32))   # hex -> vertices
+    hv_offsets: np.ndarray = field(default_factory=lambda: np.zeros(1, np.int32))
+    he_indices: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int32))   # hex -> edges
+    he_offsets: np.ndarray = field(default_factory=lambda: np.zeros(1, np.int32))
+    # int32 endpoint arrays
+    edge_v1_arr: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int32))
+    edge_v2_arr: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int32))
+    # Rectangular int32[H, 6] hex corner/side tables, for fancy-index gathers
+    hex_vertices_arr: np.ndarray = field(default_factory=lambda: np.zeros((0, 6), np.int32))
+    hex_edges_arr: np.ndarray = field(default_factory=lambda: np.zeros((0, 6), np.int32))
+    # float32[H, V] hex-corner incidence: 1 where vertex v is a corner of hex h,
+    # so `hex_vertex_matrix @ per_vertex` sums a vertex quantity per hex
+    hex_vertex_matrix: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), np.float32))
+    # Distance-rule bitmask per vertex (V <= 64): the vertex itself plus its
+    # adjacent vertices, so `mask & occupied` is nonzero exactly when a
+    # settlement there is forbidden.  uint64 array for vector tests and the
+    # same masks as Python ints for scalar tests
+    neighbor_mask: np.ndarray = field(default_factory=lambda: np.zeros(0, np.uint64))
+    neighbor_bits: Tuple[int, ...] = ()
+    # Adjacent-edge bitmask per vertex as Python ints (E = 72 overflows uint64)
+    vertex_edge_bits: Tuple[int, ...] = ()
+
+
+# Topologies are immutable once built, so every env/state can share one.
+_TOPO_CACHE: Dict[Tuple[Tuple[Tuple[int, int], ...], float], BoardTopology] = {}
+
 
 def build_board_topology(
     hex_positions: Optional[List[Tuple[int, int]]] = None,
     size: float = HEX_SIZE,
 ) -> BoardTopology:
-    """Build the complete board topology -- mirrors TS buildBoardTopology."""
+    """Build the complete board topology -- mirrors TS buildBoardTopology.
+
+    Results are cached per (hex_positions, size); callers must treat the
+    returned topology as read-only.
+    """
     if hex_positions is None:
         hex_positions = list(STANDARD_HEX_POSITIONS)
 
-    hex_centers = [hex_to_pixel(q, r, size) for q, r in hex_positions]
+    key = (tuple((int(q), int(r)) for q, r in hex_positions), float(size))
+    cached = _TOPO_CACHE.get(key)
+    if cached is not None:
+        return cached
+    topo = _build_board_topology(hex_positions, size)
+    topo.coastal_edges_sorted = _sorted_coastal_edges(topo)
+    # One topology is shared by every env and state built on these hexes.
+    _freeze(*(v for v in (getattr(topo, f.name) for f in fields(topo))
+              if isinstance(v, np.ndarray)))
+    _TOPO_CACHE[key] = topo
+    return topo
+
+
+def _freeze(*arrays: np.ndarray) -> None:
+    """Mark arrays read-only.  Used for data shared by every copy of a state."""
+    for a in arrays:
+        a.setflags(write=False)
 
-    # Step 1/2: compute corners for every hex, deduplicate vertices
+
+def _to_csr(rows: List[List[int]]) -> Tuple[np.ndarray, np.ndarray]:
+    """Flatten a ragged adjacency list into int32 (indices, offsets)."""
+    indices = np.array([x for row in rows for x in row], dtype=np.int32)
+    offsets = np.zeros(len(rows) + 1, dtype=np.int32)
+    offsets[1:] = np.cumsum([len(row) for row in rows])
+    return indices, offsets
+
+
+def _build_board_topology(
+    hex_positions: List[Tuple[int, int]],
+    size: float,
+) -> BoardTopology:
+    centers = hex_to_pixel_array(hex_positions, size)
+    corners = hex_corners_array(centers, size)  # (H, 6, 2)
+    hex_centers = [(float(x), float(y)) for x, y in centers]
+
+    # Step 1/2: compute corners for every hex, deduplicate vertices.
+    # Corners shared between hexes land on the same quantized grid cell, so
+    # dedup is a dict lookup on integer keys.
     vertex_positions: List[Tuple[float, float]] = []
+    vertex_key: Dict[Tuple[int, int], int] = {}
     hex_corner_vids: List[List[int]] = []  # [hid][corner_idx] -> vid
 
-    for hid, (cx, cy) in enumerate(hex_centers):
-        corners = hex_corners(cx, cy, size)
+    corner_keys = _quantize(corners).tolist()
+    corner_points = corners.tolist()
+    for hid in range(len(hex_positions)):
         vids: List[int] = []
-        for corner in corners:
-            existing = -1
-            for vid, vp in enumerate(vertex_positions):
-                if points_equal(vp, corner):
-                    existing = vid
-                    break
-            if existing >= 0:
-                vids.append(existing)
-            else:
-                vids.append(len(vertex_positions))
-                vertex_positions.append(corner)
+        for (kx, ky), (x, y) in zip(corner_keys[hid], corner_points[hid]):
+            key = (kx, ky)
+            vid = vertex_key.get(key)
+            if vid is None:
+                vid = len(vertex_positions)
+                vertex_key[key] = vid
+                vertex_positions.append((x, y))
+            vids.append(vid)
         hex_corner_vids.append(vids)
 
     vertex_count = len(vertex_positions)
@@ -226,11 +401,11 @@ def build_board_topology(
     hex_edges = hex_edge_ids
 
     # vertex -> hexes
-    v_adj_hexes: List[List[int]] = [[] for _ in range(vertex_count)]
+    v_hex_sets: List[Set[int]] = [set() for _ in range(vertex_count)]
     for hid in range(len(hex_positions)):
         for vid in hex_vertices[hid]:
-            if hid not in v_adj_hexes[vid]:
-                v_adj_hexes[vid].append(hid)
+            v_hex_sets[vid].add(hid)
+    v_adj_hexes = [sorted(s) for s in v_hex_sets]
 
     # vertex -> edges
     v_adj_edges: List[List[int]] = [[] for _ in range(vertex_count)]
@@ -239,23 +414,33 @@ def build_board_topology(
         v_adj_edges[v2].append(eid)
 
     # vertex -> vertices
-    v_adj_verts: List[List[int]] = [[] for _ in range(vertex_count)]
+    v_vert_sets: List[Set[int]] = [set() for _ in range(vertex_count)]
     for v1, v2 in edge_endpoints:
-        if v2 not in v_adj_verts[v1]:
-            v_adj_verts[v1].append(v2)
-        if v1 not in v_adj_verts[v2]:
-            v_adj_verts[v2].append(v1)
+        v_vert_sets[v1].add(v2)
+        v_vert_sets[v2].add(v1)
+    v_adj_verts = [sorted(s) for s in v_vert_sets]
 
     # edge -> edges (sharing a vertex)
-    e_adj_edges: List[List[int]] = [[] for _ in range(edge_count)]
-    for eid in range(edge_count):
-        v1, v2 = edge_endpoints[eid]
-        for adj_eid in v_adj_edges[v1]:
-            if adj_eid != eid and adj_eid not in e_adj_edges[eid]:
-                e_adj_edges[eid].append(adj_eid)
-        for adj_eid in v_adj_edges[v2]:
-            if adj_eid != eid and adj_eid not in e_adj_edges[eid]:
-                e_adj_edges[eid].append(adj_eid)
+    e_adj_edges: List[List[int]] = []
+    for eid, (v1, v2) in enumerate(edge_endpoints):
+        adj = set(v_adj_edges[v1])
+        adj.update(v_adj_edges[v2])
+        adj.discard(eid)
+        e_adj_edges.append(sorted(adj))
+
+    assert vertex_count <= 64, "neighbor masks need V <= 64"
+    neighbor_bits = tuple(
+        sum(1 << a for a in adj) | (1 << vid) for vid, adj in enumerate(v_adj_verts)
+    )
+
+    vae_indices, vae_offsets = _to_csr(v_adj_edges)
+    vav_indices, vav_offsets = _to_csr(v_adj_verts)
+    vah_indices, vah_offsets = _to_csr(v_adj_hexes)
+    hv_indices, hv_offsets = _to_csr(hex_vertices)
+    he_indices, he_offsets = _to_csr(hex_edges)
+    hex_vertex_matrix = np.zeros((len(hex_vertices), vertex_count), dtype=np.float32)
+    for hid, corners in enumerate(hex_vertices):
+        hex_vertex_matrix[hid, list(corners)] = 1.0
 
     return BoardTopology(
         hex_coords=list(hex_positions),
@@ -270,6 +455,26 @@ def build_board_topology(
         edge_adjacent_edges=e_adj_edges,
         hex_vertices=hex_vertices,
         hex_edges=hex_edges,
+        edge_v1=tuple(v1 for v1, _ in edge_endpoints),
+        edge_v2=tuple(v2 for _, v2 in edge_endpoints),
+        vae_indices=vae_indices,
+        vae_offsets=vae_offsets,
+        vav_indices=vav_indices,
+        vav_offsets=vav_offsets,
+        vah_indices=vah_indices,
+        vah_offsets=vah_offsets,
+        hv_indices=hv_indices,
+        hv_offsets=hv_offsets,
+        he_indices=he_indices,
+        he_offsets=he_offsets,
+        edge_v1_arr=np.array([v1 for v1, _ in edge_endpoints], dtype=np.int32),
+        edge_v2_arr=np.array([v2 for _, v2 in edge_endpoints], dtype=np.int32),
+        hex_vertices_arr=np.array(hex_vertices, dtype=np.int32).reshape(-1, 6),
+        hex_edges_arr=np.array(hex_edges, dtype=np.int32).reshape(-1, 6),
+        hex_vertex_matrix=hex_vertex_matrix,
+        neighbor_mask=np.array(neighbor_bits, dtype=np.uint64),
+        neighbor_bits=neighbor_bits,
+        vertex_edge_bits=tuple(sum(1 << e for e in adj) for adj in v_adj_edges),
     )
 
 
@@ -277,7 +482,7 @@ def build_board_topology(
 #  Harbor helpers
 # ──────────────────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class Harbor:
     type: str                   # 'generic' | resource name
     vertices: Tuple[int, int]   # the two vertices that benefit
@@ -302,8 +507,8 @@ def _get_coastal_edges(topo: BoardTopology) -> List[Tuple[int, int, int]]:
     return edges
 
 
-def assign_harbors(topo: BoardTopology) -> List[Harbor]:
-    """Assign 9 harbors to evenly spaced coastal edges.  Mirrors TS assignHarbors."""
+def _sorted_coastal_edges(topo: BoardTopology) -> List[Tuple[int, int, int]]:
+    """Coastal edges ordered by angle around the board center (harbor slot order)."""
     coastal_edges = _get_coastal_edges(topo)
 
     center_x = sum(p[0] for p in topo.hex_centers) / len(topo.hex_centers)
@@ -316,6 +521,12 @@ def assign_harbors(topo: BoardTopology) -> List[Harbor]:
         return math.atan2(my - center_y, mx - center_x)
 
     coastal_edges.sort(key=_angle)
+    return coastal_edges
+
+
+def assign_harbors(topo: BoardTopology) -> List[Harbor]:
+    """Assign 9 harbors to evenly spaced coastal edges.  Mirrors TS assignHarbors."""
+    coastal_edges = topo.coastal_edges_sorted or _sorted_coastal_edges(topo)
 
     total = len(coastal_edges)
     step = total / 9
@@ -327,6 +538,20 @@ def assign_harbors(topo: BoardTopology) -> List[Harbor]:
     return harbors
 
 
+# vertex_harbor codes: HARBOR_NONE, HARBOR_GENERIC, or 1 + resource index
+HARBOR_NONE = -1
+HARBOR_GENERIC = 0
+
+
+def build_vertex_harbor_map(harbors: List[Harbor], vertex_count: int) -> np.ndarray:
+    """int8[V] harbor code per vertex.  Harbors never share a vertex."""
+    codes = np.full(vertex_count, HARBOR_NONE, dtype=np.int8)
+    for h in harbors:
+        code = HARBOR_GENERIC if h.type == "generic" else 1 + RESOURCE_IDX[h.type]
+        codes[list(h.vertices)] = code
+    return codes
+
+
 def get_trade_ratio(harbors: List[Harbor], player_vertices: List[int], resource: str) -> int:
     """Best trade ratio for *resource* given the player's buildings.  Mirrors TS getTradeRatio."""
     ratio = 4
@@ -345,48 +570,61 @@ def get_trade_ratio(harbors: List[Harbor], player_vertices: List[int], resource:
 #  Tiny helpers
 # ──────────────────────────────────────────────────────────────────────
 
-def _empty_resources() -> Dict[str, int]:
-    return {r: 0 for r in RESOURCES}
+# Hands and the bank are int8 arrays of length NUM_RESOURCES, indexed by
+# RESOURCE_IDX (i.e. in RESOURCES order).
+
+def _empty_resources() -> np.ndarray:
+    return np.zeros(NUM_RESOURCES, dtype=np.int8)
 
 
-def _has_resources(hand: Dict[str, int], cost: Dict[str, int]) -> bool:
-    return all(hand.get(r, 0) >= cost.get(r, 0) for r in RESOURCES)
+def _full_bank() -> np.ndarray:
+    return np.full(NUM_RESOURCES, BANK_PER_RESOURCE, dtype=np.int8)
 
 
-def _total_resources(hand: Dict[str, int]) -> int:
-    return sum(hand.get(r, 0) for r in RESOURCES)
+def _total_resources(hand: np.ndarray) -> int:
+    return int(hand.sum())
 
 
-def _subtract(hand: Dict[str, int], cost: Dict[str, int]) -> Dict[str, int]:
-    return {r: hand[r] - cost.get(r, 0) for r in RESOURCES}
+def _subtract(hand: np.ndarray, cost: np.ndarray) -> np.ndarray:
+    return hand - cost
 
 
-def _add(hand: Dict[str, int], cost: Dict[str, int]) -> Dict[str, int]:
-    return {r: hand[r] + cost.get(r, 0) for r in RESOURCES}
+def _add(hand: np.ndarray, cost: np.ndarray) -> np.ndarray:
+    return hand + cost
+
+
+def _empty_dev_cards() -> np.ndarray:
+    return np.zeros(NUM_DEV_CARD_TYPES, dtype=np.int8)
+
+
+def resources_to_dict(hand: np.ndarray) -> Dict[str, int]:
+    """{resource: count} view of a hand/bank array, for callers outside the env."""
+    return {r: int(hand[i]) for i, r in enumerate(RESOURCES)}
 
 
 # ──────────────────────────────────────────────────────────────────────
 #  Player state
 # ──────────────────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class PlayerState:
     id: int
-    resources: Dict[str, int] = field(default_factory=_empty_resources)
-    dev_cards: List[str] = field(default_factory=list)      # playable
-    new_dev_cards: List[str] = field(default_factory=list)   # bought this turn
+    resources: np.ndarray = field(default_factory=_empty_resources)  # int8[NUM_RESOURCES]
+    dev_cards: np.ndarray = field(default_factory=_empty_dev_cards)      # playable, int8[DEV_CARD_TYPES]
+    new_dev_cards: np.ndarray = field(default_factory=_empty_dev_cards)  # bought this turn
     knights_played: int = 0
     remaining_settlements: int = MAX_SETTLEMENTS
     remaining_cities: int = MAX_CITIES
     remaining_roads: int = MAX_ROADS
     has_played_dev_card_this_turn: bool = False
 
-    def copy(self) -> "PlayerState":
+    def copy(self, resources: Optional[np.ndarray] = None) -> "PlayerState":
+        """Copy; *resources* (e.g. a row of a copied hands matrix) replaces the hand copy."""
         return PlayerState(
             id=self.id,
-            resources=dict(self.resources),
-            dev_cards=list(self.dev_cards),
-            new_dev_cards=list(self.new_dev_cards),
+            resources=self.resources.copy() if resources is None else resources,
+            dev_cards=self.dev_cards.copy(),
+            new_dev_cards=self.new_dev_cards.copy(),
             knights_played=self.knights_played,
             remaining_settlements=self.remaining_settlements,
             remaining_cities=self.remaining_cities,
@@ -399,7 +637,7 @@ class PlayerState:
 #  Game state (mutable -- we copy before modifying)
 # ──────────────────────────────────────────────────────────────────────
 
-@dataclass
+@dataclass(slots=True)
 class CatanState:
     # Phase / turn
     phase: str = "PRE_GAME"
@@ -407,23 +645,37 @@ class CatanState:
     player_count: int = 4
     turn_number: int = 0
 
-    # Board (set during reset)
+    # Board (set during reset).  topology, the hex_* arrays, vertex_setup_grant,
+    # vertex_harbor and dev_card_deck are read-only and shared between copies;
+    # writing to them raises.
     topology: Optional[BoardTopology] = None
-    hex_terrains: List[str] = field(default_factory=list)    # [hid] -> terrain
-    hex_numbers: List[Optional[int]] = field(default_factory=list)  # [hid] -> token or None
-    vertex_buildings: List[Optional[Tuple[str, int]]] = field(default_factory=list)  # (type, owner) | None
-    edge_roads: List[Optional[int]] = field(default_factory=list)   # owner | None
+    hex_terrains: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int8))      # [hid] -> terrain id
+    hex_numbers: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int8))       # [hid] -> token | 0
+    hex_resource_ids: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int8))  # [hid] -> res idx | -1
+    vertex_setup_grant: np.ndarray = field(                                             # [vid] -> int8[NUM_RESOURCES]
+        default_factory=lambda: np.zeros((0, NUM_RESOURCES), np.int8))                  # second setup settlement income
+    vertex_building_type: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int8))   # [vid] -> BUILDING_*
+    vertex_building_owner: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int8))  # [vid] -> owner | NO_OWNER
+    edge_roads: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int8))             # [eid] -> owner | NO_OWNER
+    occupied_vertex_mask: int = 0  # bit vid set <=> vertex_building_type[vid] != BUILDING_NONE
+    player_road_mask: List[int] = field(default_factory=list)  # [pid] -> bit eid set <=> edge_roads[eid] == pid
+    road_lengths: List[int] = field(default_factory=list)      # [pid] -> calculate_longest_road(state, pid)
     harbors: List[Harbor] = field(default_factory=list)
+    vertex_harbor: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int8))  # [vid] -> HARBOR_* code
     robber_hex: int = 0
 
-    # Players
+    # Players.  hands[pid] is the same int8[NUM_RESOURCES] buffer as
+    # players[pid].resources, so per-player code and whole-table ops agree.
     players: List[PlayerState] = field(default_factory=list)
+    hands: np.ndarray = field(default_factory=lambda: np.zeros((0, NUM_RESOURCES), np.int8))
 
-    # Dev card deck (draw from end)
-    dev_card_deck: List[str] = field(default_factory=list)
+    # Dev card deck as DEV_CARD_TYPES ids; cards are drawn from
+    # dev_card_deck[dev_card_deck_top - 1] downwards
+    dev_card_deck: np.ndarray = field(default_factory=lambda: np.zeros(0, np.int8))
+    dev_card_deck_top: int = 0
 
     # Bank
-    bank: Dict[str, int] = field(default_factory=lambda: {r: BANK_PER_RESOURCE for r in RESOURCES})
+    bank: np.ndarray = field(default_factory=_full_bank)  # int8[NUM_RESOURCES]
 
     # Awards
     longest_road_player: Optional[int] = None
@@ -450,23 +702,43 @@ class CatanState:
     # Winner (player id or None)
     winner: Optional[int] = None
 
+    # Derived-data caches keyed on _build_version, which every building
+    # placement bumps.  Cached values are rebuilt, never mutated, so copies
+    # can share them.
+    _build_version: int = 0
+    _cache_version: int = -1
+    _player_vertices_cache: Optional[List[List[int]]] = None
+    _trade_ratio_cache: Optional[np.ndarray] = None   # int8[P, NUM_RESOURCES]
+    # Owned by feature_extractor: ((_build_version, robber_hex), features)
+    _feature_cache: Optional[tuple] = None
+
     def copy(self) -> "CatanState":
         """Return a deep-enough copy for stepping."""
+        hands = self.hands.copy()
         s = CatanState(
             phase=self.phase,
             current_player=self.current_player,
             player_count=self.player_count,
             turn_number=self.turn_number,
             topology=self.topology,               # shared (immutable)
-            hex_terrains=self.hex_terrains,        # shared (immutable after setup)
+            hex_terrains=self.hex_terrains,        # shared (read-only, see reset)
             hex_numbers=self.hex_numbers,          # shared
-            vertex_buildings=list(self.vertex_buildings),
-            edge_roads=list(self.edge_roads),
+            hex_resource_ids=self.hex_resource_ids,  # shared
+            vertex_setup_grant=self.vertex_setup_grant,  # shared
+            vertex_building_type=self.vertex_building_type.copy(),
+            vertex_building_owner=self.vertex_building_owner.copy(),
+            edge_roads=self.edge_roads.copy(),
+            occupied_vertex_mask=self.occupied_vertex_mask,
+            player_road_mask=list(self.player_road_mask),
+            road_lengths=list(self.road_lengths),
             harbors=self.harbors,                  # shared
+            vertex_harbor=self.vertex_harbor,      # shared
             robber_hex=self.robber_hex,
-            players=[p.copy() for p in self.players],
-            dev_card_deck=list(self.dev_card_deck),
-            bank=dict(self.bank),
+            players=[p.copy(hands[i]) for i, p in enumerate(self.players)],
+            hands=hands,
+            dev_card_deck=self.dev_card_deck,    # shared (only the top moves)
+            dev_card_deck_top=self.dev_card_deck_top,
+            bank=self.bank.copy(),
             longest_road_player=self.longest_road_player,
             longest_road_length=self.longest_road_length,
             largest_army_player=self.largest_army_player,
@@ -478,9 +750,19 @@ class CatanState:
             road_building_roads_left=self.road_building_roads_left,
             last_placed_vertex=self.last_placed_vertex,
             winner=self.winner,
+            _build_version=self._build_version,
+            _cache_version=self._cache_version,
+            _player_vertices_cache=self._player_vertices_cache,
+            _trade_ratio_cache=self._trade_ratio_cache,
+            _feature_cache=self._feature_cache,
         )
         return s
 
+    @property
+    def hex_terrain_names(self) -> List[str]:
+        """Terrain names per hex (hex_terrains holds TERRAIN_TYPES ids)."""
+        return [TERRAIN_TYPES[t] for t in self.hex_terrains.tolist()]
+
 
 # ──────────────────────────────────────────────────────────────────────
 #  Setup order (snake draft)
@@ -499,70 +781,172 @@ def get_setup_order(player_count: int) -> List[int]:
 def calculate_longest_road(state: CatanState, player: int) -> int:
     topo = state.topology
     assert topo is not None
-
-    player_edges: Set[int] = set()
-    for eid in range(topo.edge_count):
-        if state.edge_roads[eid] == player:
-            player_edges.add(eid)
-
-    if not player_edges:
+    if HAS_NUMBA:
+        return _calculate_longest_road_jit(state, player)
+
+    edge_v1, edge_v2 = topo.edge_v1, topo.edge_v2
+    owners = state.vertex_building_owner
+    blocked = ((owners != NO_OWNER) & (owners != player)).tolist()
+
+    # Player-only adjacency: vertex -> [(edge bit, other end, other end blocked)].
+    # Opponent buildings end a path (the edge into them still counts).
+    adj: Dict[int, List[Tuple[int, int, bool]]] = {}
+    player_mask = state.player_road_mask[player]
+    if not player_mask:
         return 0
-
-    start_vertices: Set[int] = set()
-    for eid in player_edges:
-        v1, v2 = topo.edge_endpoints[eid]
-        start_vertices.add(v1)
-        start_vertices.add(v2)
-
+    roads = player_mask
+    while roads:
+        bit = roads & -roads
+        roads ^= bit
+        eid = bit.bit_length() - 1
+        v1, v2 = edge_v1[eid], edge_v2[eid]
+        adj.setdefault(v1, []).append((bit, v2, blocked[v2]))
+        adj.setdefault(v2, []).append((bit, v1, blocked[v1]))
+
+    # No path can be longer than the player's road count; stop as soon as
+    # one uses every road.  Path ends (degree-1 vertices) are tried first
+    # since that is where a full-network path must start.
+    n_roads = player_mask.bit_count()
     max_length = 0
-    for sv in start_vertices:
-        visited: Set[int] = set()
-        length = _lr_dfs(state, player, player_edges, sv, visited)
+    for sv in sorted(adj, key=lambda v: len(adj[v])):
+        length = _lr_dfs(adj, sv, n_roads)
         if length > max_length:
             max_length = length
+            if max_length == n_roads:
+                break
     return max_length
 
 
-def _lr_dfs(
-    state: CatanState,
-    player: int,
-    player_edges: Set[int],
-    vertex: int,
-    visited_edges: Set[int],
-) -> int:
-    topo = state.topology
-    assert topo is not None
+def _lr_dfs(adj: Dict[int, List[Tuple[int, int, bool]]], start: int, n_roads: int) -> int:
+    """Longest simple edge-path from *start* through *adj*.
+
+    Iterative DFS; each stack entry carries its own visited-edge bitmask.
+    Returns early once a path uses all *n_roads* roads.
+    """
     max_len = 0
+    stack = [(start, 0, 0)]  # (vertex, visited_mask, length)
+    pop, push = stack.pop, stack.append
+    while stack:
+        vertex, visited, length = pop()
+        if length > max_len:
+            max_len = length
+            if max_len == n_roads:
+                break
+        nxt = length + 1
+        for bit, next_v, blocked in adj[vertex]:
+            if visited & bit:
+                continue
+            if blocked:
+                if nxt > max_len:
+                    max_len = nxt
+            else:
+                push((next_v, visited | bit, nxt))
+    return max_len
 
-    for eid in topo.vertex_adjacent_edges[vertex]:
-        if eid not in player_edges:
-            continue
-        if eid in visited_edges:
+
+def _calculate_longest_road_jit(state: CatanState, player: int) -> int:
+    if not state.player_road_mask[player]:
+        return 0
+    topo = state.topology
+    player_edges = state.edge_roads == player
+    owners = state.vertex_building_owner
+    blocked = (owners != NO_OWNER) & (owners != player)
+    return int(_longest_road_numba(
+        topo.vae_indices, topo.vae_offsets, topo.edge_v1_arr, topo.edge_v2_arr,
+        blocked, player_edges,
+    ))
+
+
+@njit(cache=True)
+def _longest_road_numba(
+    vae_indices, vae_offsets, edge_v1, edge_v2, blocked_vertex_mask, player_edge_mask
+):
+    """Backtracking DFS over boolean edge/vertex masks (72 edges overflow a uint64).
+
+    Every endpoint of a player edge is tried as a start vertex; the search
+    stops early once a path uses all of the player's roads.
+    """
+    n_edges = edge_v1.shape[0]
+    n_verts = vae_offsets.shape[0] - 1
+    n_roads = 0
+    for eid in range(n_edges):
+        if player_edge_mask[eid]:
+            n_roads += 1
+    visited = np.zeros(n_edges, dtype=np.bool_)
+    stack_v = np.empty(n_edges + 1, dtype=np.int32)   # vertex at each depth
+    stack_k = np.empty(n_edges + 1, dtype=np.int32)   # next CSR slot to try
+    stack_e = np.empty(n_edges + 1, dtype=np.int32)   # edge used to reach it
+    best = 0
+    for sv in range(n_verts):
+        if best == n_roads:
+            break
+        has_road = False
+        for k in range(vae_offsets[sv], vae_offsets[sv + 1]):
+            if player_edge_mask[vae_indices[k]]:
+                has_road = True
+                break
+        if not has_road:
             continue
-        v1, v2 = topo.edge_endpoints[eid]
-        next_v = v2 if v1 == vertex else v1
+        depth = 0
+        stack_v[0] = sv
+        stack_k[0] = vae_offsets[sv]
+        stack_e[0] = -1
+        while depth >= 0:
+            v = stack_v[depth]
+            k = stack_k[depth]
+            if k == vae_offsets[v + 1]:
+                e = stack_e[depth]
+                if e >= 0:
+                    visited[e] = False
+                depth -= 1
+                continue
+            stack_k[depth] = k + 1
+            eid = vae_indices[k]
+            if not player_edge_mask[eid] or visited[eid]:
+                continue
+            nv = edge_v2[eid] if edge_v1[eid] == v else edge_v1[eid]
+            if depth + 1 > best:
+                best = depth + 1
+            if blocked_vertex_mask[nv]:
+                continue
+            visited[eid] = True
+            depth += 1
+            stack_v[depth] = nv
+            stack_k[depth] = vae_offsets[nv]
+            stack_e[depth] = eid
+    return best
 
-        bldg = state.vertex_buildings[next_v]
-        blocked = bldg is not None and bldg[1] != player
 
-        visited_edges.add(eid)
-        if blocked:
-            max_len = max(max_len, 1)
-        else:
-            path = 1 + _lr_dfs(state, player, player_edges, next_v, visited_edges)
-            max_len = max(max_len, path)
-        visited_edges.discard(eid)
+def _road_placed(state: CatanState, player: int) -> None:
+    """Refresh road_lengths after *player* placed a road (only theirs can grow)."""
+    state.road_lengths[player] = calculate_longest_road(state, player)
 
-    return max_len
+
+def _settlement_placed(state: CatanState, vertex: int, player: int) -> None:
+    """Refresh road_lengths after *player* settled *vertex*.
+
+    Only opponents with a road at *vertex* can have a path cut there.
+    """
+    topo = state.topology
+    assert topo is not None
+    roads = state.edge_roads
+    for eid in topo.vertex_adjacent_edges[vertex]:
+        owner = int(roads[eid])
+        if owner != NO_OWNER and owner != player:
+            state.road_lengths[owner] = calculate_longest_road(state, owner)
 
 
 def update_longest_road(state: CatanState) -> None:
-    """In-place update of longest road awards.  Mirrors TS updateLongestRoad."""
+    """In-place update of longest road awards.  Mirrors TS updateLongestRoad.
+
+    Reads the per-player lengths kept current by the placement helpers.
+    """
     longest_length = state.longest_road_length
     longest_player = state.longest_road_player
+    lengths = state.road_lengths
 
     for pid in range(state.player_count):
-        length = calculate_longest_road(state, pid)
+        length = lengths[pid]
         if length >= MIN_LONGEST_ROAD:
             if longest_player is None:
                 longest_player = pid
@@ -573,12 +957,12 @@ def update_longest_road(state: CatanState) -> None:
 
     # Check if current holder still qualifies
     if longest_player is not None:
-        cur = calculate_longest_road(state, longest_player)
+        cur = lengths[longest_player]
         if cur < MIN_LONGEST_ROAD:
             longest_player = None
             longest_length = 0
             for pid in range(state.player_count):
-                length = calculate_longest_road(state, pid)
+                length = lengths[pid]
                 if length >= MIN_LONGEST_ROAD and length > longest_length:
                     longest_player = pid
                     longest_length = length
@@ -613,14 +997,31 @@ def update_largest_army(state: CatanState) -> None:
 #  Victory points
 # ──────────────────────────────────────────────────────────────────────
 
+def calculate_all_vps(state: CatanState) -> np.ndarray:
+    """Victory points of every player, as an int64[player_count] array."""
+    n = state.player_count
+    owners = state.vertex_building_owner
+    owned = owners != NO_OWNER
+    # Building codes double as VP (settlement 1, city 2)
+    vps = np.bincount(
+        owners[owned], weights=state.vertex_building_type[owned], minlength=n
+    ).astype(np.int64)
+
+    if state.longest_road_player is not None:
+        vps[state.longest_road_player] += 2
+    if state.largest_army_player is not None:
+        vps[state.largest_army_player] += 2
+
+    vps += [int(p.dev_cards[VICTORY_POINT_ID]) + int(p.new_dev_cards[VICTORY_POINT_ID])
+            for p in state.players]
+    return vps
+
+
 def calculate_vp(state: CatanState, player: int) -> int:
-    vp = 0
-    topo = state.topology
-    assert topo is not None
-    for vid in range(topo.vertex_count):
-        b = state.vertex_buildings[vid]
-        if b is not None and b[1] == player:
-            vp += 2 if b[0] == "city" else 1
+    """Single-player VP; prefer calculate_all_vps when scoring every player."""
+    # Building codes double as VP (settlement 1, city 2)
+    owned = state.vertex_building_owner == player
+    vp = int(state.vertex_building_type[owned].sum())
 
     if state.longest_road_player == player:
         vp += 2
@@ -628,8 +1029,7 @@ def calculate_vp(state: CatanState, player: int) -> int:
         vp += 2
 
     p = state.players[player]
-    vp += sum(1 for c in p.dev_cards if c == "victory_point")
-    vp += sum(1 for c in p.new_dev_cards if c == "victory_point")
+    vp += int(p.dev_cards[VICTORY_POINT_ID]) + int(p.new_dev_cards[VICTORY_POINT_ID])
     return vp
 
 
@@ -646,12 +1046,40 @@ def check_game_over(state: CatanState) -> None:
 
 def _is_vertex_accessible(state: CatanState, player: int, vertex: int) -> bool:
     """Can the player build a road touching this vertex?"""
-    bldg = state.vertex_buildings[vertex]
-    if bldg is not None:
-        return bldg[1] == player  # own building OK, opponent blocks
+    owner = state.vertex_building_owner[vertex]
+    if owner != NO_OWNER:
+        return bool(owner == player)  # own building OK, opponent blocks
+    topo = state.topology
+    assert topo is not None
+    return bool(topo.vertex_edge_bits[vertex] & state.player_road_mask[player])
+
+
+def _mask_bits(mask: int) -> List[int]:
+    """Indices of the set bits of *mask*, ascending."""
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+
+def _player_road_vertices(state: CatanState, player: int) -> np.ndarray:
+    """Bool[V]: vertex touches one of *player*'s roads."""
     topo = state.topology
     assert topo is not None
-    return any(state.edge_roads[eid] == player for eid in topo.vertex_adjacent_edges[vertex])
+    own = state.edge_roads == player
+    touched = np.zeros(topo.vertex_count, dtype=np.bool_)
+    touched[topo.edge_v1_arr[own]] = True
+    touched[topo.edge_v2_arr[own]] = True
+    return touched
+
+
+def _adjacent_to_building(state: CatanState) -> np.ndarray:
+    """Bool[V]: vertex is occupied or neighbours an occupied vertex (distance rule)."""
+    topo = state.topology
+    assert topo is not None
+    return (topo.neighbor_mask & np.uint64(state.occupied_vertex_mask)) != 0
 
 
 def get_valid_road_edges_no_resource_check(state: CatanState, player: int) -> List[int]:
@@ -659,21 +1087,35 @@ def get_valid_road_edges_no_resource_check(state: CatanState, player: int) -> Li
     assert topo is not None
     if state.players[player].remaining_roads <= 0:
         return []
-    valid: List[int] = []
-    for eid in range(topo.edge_count):
-        if state.edge_roads[eid] is not None:
-            continue
-        v1, v2 = topo.edge_endpoints[eid]
-        if _is_vertex_accessible(state, player, v1) or _is_vertex_accessible(state, player, v2):
-            valid.append(eid)
-    return valid
+    # Same rule as _is_vertex_accessible, as edge bitmasks: edges around the
+    # player's buildings plus edges around unoccupied ends of their roads.
+    edge_bits = topo.vertex_edge_bits
+    edge_v1, edge_v2 = topo.edge_v1, topo.edge_v2
+    occupied = state.occupied_vertex_mask
+    reach = 0
+    for vid in _get_player_vertices(state, player):
+        reach |= edge_bits[vid]
+    roads = state.player_road_mask[player]
+    while roads:
+        low = roads & -roads
+        roads ^= low
+        eid = low.bit_length() - 1
+        v = edge_v1[eid]
+        if not (occupied >> v) & 1:
+            reach |= edge_bits[v]
+        v = edge_v2[eid]
+        if not (occupied >> v) & 1:
+            reach |= edge_bits[v]
+    for mask in state.player_road_mask:
+        reach &= ~mask
+    return _mask_bits(reach)
 
 
 def get_valid_road_edges(state: CatanState, player: int) -> List[int]:
     p = state.players[player]
     if p.remaining_roads <= 0:
         return []
-    if not _has_resources(p.resources, ROAD_COST):
+    if not _can_afford_road(p.resources.tolist()):
         return []
     return get_valid_road_edges_no_resource_check(state, player)
 
@@ -682,56 +1124,34 @@ def _is_valid_settlement_vertex(state: CatanState, player: int, vid: int) -> boo
     """Check if a specific vertex is valid for settlement placement (main game)."""
     topo = state.topology
     assert topo is not None
-    if state.vertex_buildings[vid] is not None:
+    if topo.neighbor_bits[vid] & state.occupied_vertex_mask:
         return False
-    for adj in topo.vertex_adjacent_vertices[vid]:
-        if state.vertex_buildings[adj] is not None:
-            return False
     # Must be connected to player's road network
-    if not any(state.edge_roads[eid] == player for eid in topo.vertex_adjacent_edges[vid]):
-        return False
-    return True
+    return bool(topo.vertex_edge_bits[vid] & state.player_road_mask[player])
 
 
 def get_valid_settlement_vertices(state: CatanState, player: int) -> List[int]:
     p = state.players[player]
     if p.remaining_settlements <= 0:
         return []
-    if not _has_resources(p.resources, SETTLEMENT_COST):
+    if not _can_afford_settlement(p.resources.tolist()):
         return []
-    topo = state.topology
-    assert topo is not None
-    return [vid for vid in range(topo.vertex_count) if _is_valid_settlement_vertex(state, player, vid)]
+    valid = ~_adjacent_to_building(state) & _player_road_vertices(state, player)
+    return valid.nonzero()[0].tolist()
 
 
 def get_valid_city_vertices(state: CatanState, player: int) -> List[int]:
     p = state.players[player]
     if p.remaining_cities <= 0:
         return []
-    if not _has_resources(p.resources, CITY_COST):
+    if not _can_afford_city(p.resources.tolist()):
         return []
-    topo = state.topology
-    assert topo is not None
-    return [
-        vid for vid in range(topo.vertex_count)
-        if state.vertex_buildings[vid] is not None
-        and state.vertex_buildings[vid][0] == "settlement"
-        and state.vertex_buildings[vid][1] == player
-    ]
+    mine = (state.vertex_building_type == BUILDING_SETTLEMENT) & (state.vertex_building_owner == player)
+    return mine.nonzero()[0].tolist()
 
 
 def get_valid_setup_settlement_vertices(state: CatanState) -> List[int]:
-    topo = state.topology
-    assert topo is not None
-    valid: List[int] = []
-    for vid in range(topo.vertex_count):
-        if state.vertex_buildings[vid] is not None:
-            continue
-        has_adj = any(state.vertex_buildings[adj] is not None for adj in topo.vertex_adjacent_vertices[vid])
-        if has_adj:
-            continue
-        valid.append(vid)
-    return valid
+    return (~_adjacent_to_building(state)).nonzero()[0].tolist()
 
 
 def get_valid_setup_road_edges(state: CatanState) -> List[int]:
@@ -739,10 +1159,9 @@ def get_valid_setup_road_edges(state: CatanState) -> List[int]:
         return []
     topo = state.topology
     assert topo is not None
-    return [
-        eid for eid in topo.vertex_adjacent_edges[state.last_placed_vertex]
-        if state.edge_roads[eid] is None
-    ]
+    v = state.last_placed_vertex
+    eids = topo.vae_indices[topo.vae_offsets[v]:topo.vae_offsets[v + 1]]
+    return eids[state.edge_roads[eids] == NO_OWNER].tolist()
 
 
 def get_valid_robber_hexes(state: CatanState) -> List[int]:
@@ -752,44 +1171,102 @@ def get_valid_robber_hexes(state: CatanState) -> List[int]:
 def get_steal_targets(state: CatanState, hex_id: int, thief: int) -> List[int]:
     topo = state.topology
     assert topo is not None
-    targets: Set[int] = set()
-    for vid in topo.hex_vertices[hex_id]:
-        b = state.vertex_buildings[vid]
-        if b is not None and b[1] != thief:
-            if _total_resources(state.players[b[1]].resources) > 0:
-                targets.add(b[1])
-    return sorted(targets)
+    owners = set(state.vertex_building_owner[topo.hex_vertices_arr[hex_id]].tolist())
+    return [
+        owner for owner in sorted(owners)
+        if owner != NO_OWNER and owner != thief
+        and _total_resources(state.players[owner].resources) > 0
+    ]
+
+
+def _refresh_building_caches(state: CatanState) -> None:
+    """Rebuild per-player vertex lists and trade ratios if buildings changed."""
+    if state._cache_version == state._build_version:
+        return
+    owners = state.vertex_building_owner
+    player_vertices: List[List[int]] = []
+    ratios = np.full((state.player_count, NUM_RESOURCES), 4, dtype=np.int8)
+    for pid in range(state.player_count):
+        owned = owners == pid
+        player_vertices.append(owned.nonzero()[0].tolist())
+        codes = state.vertex_harbor[owned]
+        if (codes == HARBOR_GENERIC).any():
+            ratios[pid] = 3
+        ratios[pid, codes[codes > HARBOR_GENERIC] - 1] = 2
+    state._player_vertices_cache = player_vertices
+    state._trade_ratio_cache = ratios
+    state._cache_version = state._build_version
 
 
 def _get_player_vertices(state: CatanState, player: int) -> List[int]:
-    topo = state.topology
-    assert topo is not None
-    return [
-        vid for vid in range(topo.vertex_count)
-        if state.vertex_buildings[vid] is not None and state.vertex_buildings[vid][1] == player
-    ]
+    """Vertices holding *player*'s buildings (cached; do not mutate)."""
+    _refresh_building_caches(state)
+    return state._player_vertices_cache[player]
 
 
 def _get_player_trade_ratio(state: CatanState, player: int, resource: str) -> int:
-    pverts = _get_player_vertices(state, player)
-    return get_trade_ratio(state.harbors, pverts, resource)
+    _refresh_building_caches(state)
+    return int(state._trade_ratio_cache[player, RESOURCE_IDX[resource]])
+
+
+def _get_player_trade_ratios(state: CatanState, player: int) -> np.ndarray:
+    """int8[NUM_RESOURCES] maritime ratio per give resource (cached; do not mutate)."""
+    _refresh_building_caches(state)
+    return state._trade_ratio_cache[player]
 
 
 def is_valid_maritime_trade(state: CatanState, player: int, give: str, receive: str) -> bool:
     if give == receive:
         return False
     ratio = _get_player_trade_ratio(state, player, give)
-    if state.players[player].resources[give] < ratio:
+    if state.players[player].resources[RESOURCE_IDX[give]] < ratio:
         return False
-    if state.bank[receive] <= 0:
+    if state.bank[RESOURCE_IDX[receive]] <= 0:
         return False
     return True
 
 
+def _resource_bits(flags: List[bool]) -> int:
+    """Pack per-resource flags (RESOURCES order) into a 5-bit mask."""
+    bits = 0
+    for i, flag in enumerate(flags):
+        if flag:
+            bits |= 1 << i
+    return bits
+
+
+# The two action lists below depend only on small resource masks, so every
+# possible list (32 x 32 keys) is built at most once and then shared.
+
+@lru_cache(maxsize=None)
+def _maritime_trade_actions(give_bits: int, receive_bits: int) -> Tuple[tuple, ...]:
+    """MARITIME_TRADE actions for the resources one can give / the bank can pay."""
+    return tuple(
+        ("MARITIME_TRADE", give, receive)
+        for g, give in enumerate(RESOURCES) if give_bits >> g & 1
+        for r, receive in enumerate(RESOURCES) if receive_bits >> r & 1 and r != g
+    )
+
+
+@lru_cache(maxsize=None)
+def _year_of_plenty_actions(single_bits: int, double_bits: int) -> Tuple[tuple, ...]:
+    """YoP picks given the bank resources with >= 1 and >= 2 cards left."""
+    actions = []
+    for i, r1 in enumerate(RESOURCES):
+        for j in range(i, NUM_RESOURCES):
+            if i == j:
+                ok = double_bits >> i & 1
+            else:
+                ok = single_bits >> i & 1 and single_bits >> j & 1
+            if ok:
+                actions.append(("PICK_YEAR_OF_PLENTY_RESOURCES", r1, RESOURCES[j]))
+    return tuple(actions)
+
+
 def can_buy_dev_card(state: CatanState, player: int) -> bool:
-    if len(state.dev_card_deck) == 0:
+    if state.dev_card_deck_top <= 0:
         return False
-    return _has_resources(state.players[player].resources, DEV_CARD_COST)
+    return _can_afford_dev_card(state.players[player].resources.tolist())
 
 
 def can_play_dev_card(state: CatanState, player: int, card_type: str) -> bool:
@@ -797,51 +1274,259 @@ def can_play_dev_card(state: CatanState, player: int, card_type: str) -> bool:
         return False
     if card_type == "victory_point":
         return False
-    return card_type in state.players[player].dev_cards
+    return bool(state.players[player].dev_cards[DEV_CARD_IDX[card_type]] > 0)
 
 
 # ──────────────────────────────────────────────────────────────────────
 #  Action application helpers  (mutate *state* in-place)
 # ──────────────────────────────────────────────────────────────────────
 
+def build_vertex_setup_grant(topo: BoardTopology, hex_resource_ids: np.ndarray) -> np.ndarray:
+    """int8[V, NUM_RESOURCES]: cards a settlement on each vertex collects in setup round 2."""
+    verts = np.repeat(np.arange(topo.vertex_count), np.diff(topo.vah_offsets))
+    res = hex_resource_ids[topo.vah_indices]
+    grant = np.zeros((topo.vertex_count, NUM_RESOURCES), dtype=np.int8)
+    producing = res >= 0
+    np.add.at(grant, (verts[producing], res[producing]), 1)
+    return grant
+
+
 def _distribute_resources(state: CatanState, dice_total: int) -> None:
     if dice_total == 7:
         return
     topo = state.topology
     assert topo is not None
-    for hid in range(len(state.hex_terrains)):
-        if state.hex_numbers[hid] != dice_total:
+    if HAS_NUMBA:
+        _distribute_resources_numba(
+            state.hex_numbers, state.hex_resource_ids, state.robber_hex, topo.hex_vertices_arr,
+            state.vertex_building_type, state.vertex_building_owner, state.hands, state.bank,
+            dice_total,
+        )
+        return
+    producing = (state.hex_numbers == dice_total) & (state.hex_resource_ids >= 0)
+    producing[state.robber_hex] = False
+    active = producing.nonzero()[0]
+    if active.size == 0:
+        return
+
+    # Gather (n_active, 6) building codes (= yield: settlement 1, city 2) and owners
+    corners = topo.hex_vertices_arr[active]
+    amounts = state.vertex_building_type[corners]
+    owners = state.vertex_building_owner[corners]
+    totals = amounts.sum(axis=1).tolist()
+
+    # The bank check is per hex, in hex order: if the bank can't cover a
+    # hex's whole demand, nobody gets anything from that hex.
+    for i, hid in enumerate(active.tolist()):
+        total = totals[i]
+        if total == 0:
             continue
-        if hid == state.robber_hex:
+        resource = state.hex_resource_ids[hid]
+        if total > state.bank[resource]:
             continue
-        resource = TERRAIN_TO_RESOURCE.get(state.hex_terrains[hid])
-        if resource is None:
+        state.bank[resource] -= total
+        for amount, owner in zip(amounts[i].tolist(), owners[i].tolist()):
+            if amount:
+                state.players[owner].resources[resource] += amount
+
+
+@njit(cache=True)
+def _distribute_resources_numba(
+    hex_numbers, hex_resource_ids, robber_hex, hex_vertices, building_type, building_owner,
+    hands, bank, dice_total,
+):
+    """In-place production for one roll; same per-hex bank rule as the Python path."""
+    for hid in range(hex_numbers.shape[0]):
+        if hex_numbers[hid] != dice_total or hid == robber_hex:
             continue
-        total_demand = 0
-        player_demand: Dict[int, int] = {}
-        for vid in topo.hex_vertices[hid]:
-            b = state.vertex_buildings[vid]
-            if b is None:
-                continue
-            amount = 2 if b[0] == "city" else 1
-            total_demand += amount
-            player_demand[b[1]] = player_demand.get(b[1], 0) + amount
-        if total_demand > state.bank[resource]:
+        resource = hex_resource_ids[hid]
+        if resource < 0:
             continue
-        for pid, amount in player_demand.items():
-            state.players[pid].resources[resource] += amount
-            state.bank[resource] -= amount
+        total = 0
+        for k in range(hex_vertices.shape[1]):
+            total += building_type[hex_vertices[hid, k]]
+        if total == 0 or total > bank[resource]:
+            continue
+        bank[resource] -= total
+        for k in range(hex_vertices.shape[1]):
+            vid = hex_vertices[hid, k]
+            if building_type[vid] != 0:
+                hands[building_owner[vid], resource] += building_type[vid]
 
 
-def _remove_dev_card(cards: List[str], card_type: str) -> List[str]:
-    idx = -1
-    for i, c in enumerate(cards):
-        if c == card_type:
-            idx = i
-            break
-    if idx == -1:
-        return list(cards)
-    return cards[:idx] + cards[idx + 1:]
+# ──────────────────────────────────────────────────────────────────────
+#  Discard enumeration
+# ──────────────────────────────────────────────────────────────────────
+
+@njit(cache=True)
+def _enumerate_discard_numba(hand, count, out):
+    """Fill *out* with every int8[5] split of *count* cards drawn from *hand*.
+
+    Rows come out in lexicographic order, like the recursive Python
+    enumerator; the ore column is whatever is left after the first four.
+    Returns the number of rows written.
+    """
+    c0, c1, c2, c3, c4 = hand[0], hand[1], hand[2], hand[3], hand[4]
+    s1 = c1 + c2 + c3 + c4
+    s2 = c2 + c3 + c4
+    s3 = c3 + c4
+    n = 0
+    for a in range(min(c0, count) + 1):
+        r0 = count - a
+        if r0 > s1:
+            continue
+        for b in range(min(c1, r0) + 1):
+            r1 = r0 - b
+            if r1 > s2:
+                continue
+            for c in range(min(c2, r1) + 1):
+                r2 = r1 - c
+                if r2 > s3:
+                    continue
+                for d in range(min(c3, r2) + 1):
+                    r3 = r2 - d
+                    if r3 > c4:
+                        continue
+                    out[n, 0] = a
+                    out[n, 1] = b
+                    out[n, 2] = c
+                    out[n, 3] = d
+                    out[n, 4] = r3
+                    n += 1
+    return n
+
+
+# ──────────────────────────────────────────────────────────────────────
+#  Integer action codes
+# ──────────────────────────────────────────────────────────────────────
+# A code packs the action type (index into ACTION_TYPES) into the low
+# ACTION_OP_BITS and the payload above it.  A single id (vertex / edge /
+# hex) takes the rest of the word; several small fields (resource indexes,
+# discard counts) take ACTION_FIELD_BITS each.  Every code fits in int32.
+
+ACTION_OP_BITS = 5
+ACTION_FIELD_BITS = 5
+_OP_MASK = (1 << ACTION_OP_BITS) - 1
+_FIELD_MASK = (1 << ACTION_FIELD_BITS) - 1
+
+# Payload layout per action type: "i" one id, "r" resource index,
+# "p" steal target (pid + 1, 0 = nobody), "n" small count
+_ACTION_ARGS: Dict[str, str] = {
+    "PLACE_SETUP_SETTLEMENT": "i",
+    "PLACE_SETUP_ROAD": "i",
+    "ROLL_DICE": "",
+    "DISCARD_RESOURCES": "nnnnn",
+    "MOVE_ROBBER": "i",
+    "STEAL_RESOURCE": "p",
+    "BUILD_ROAD": "i",
+    "BUILD_SETTLEMENT": "i",
+    "BUILD_CITY": "i",
+    "BUY_DEV_CARD": "",
+    "PLAY_KNIGHT": "",
+    "PLAY_ROAD_BUILDING": "",
+    "PLACE_ROAD_BUILDING_ROAD": "i",
+    "PLAY_YEAR_OF_PLENTY": "",
+    "PICK_YEAR_OF_PLENTY_RESOURCES": "rr",
+    "PLAY_MONOPOLY": "",
+    "PICK_MONOPOLY_RESOURCE": "r",
+    "MARITIME_TRADE": "rr",
+    "END_TURN": "",
+}
+ACTION_TYPES: List[str] = list(_ACTION_ARGS)
+ACTION_TYPE_IDX: Dict[str, int] = {t: i for i, t in enumerate(ACTION_TYPES)}
+
+
+def encode_action(action: tuple) -> int:
+    """Pack an action tuple into its integer code."""
+    kind = action[0]
+    op = ACTION_TYPE_IDX[kind]
+    layout = _ACTION_ARGS[kind]
+    if layout == "i":
+        return op | (action[1] << ACTION_OP_BITS)
+    code = op
+    shift = ACTION_OP_BITS
+    for f, arg in zip(layout, action[1:]):
+        if f == "r":
+            value = RESOURCE_IDX[arg]
+        elif f == "p":
+            value = 0 if arg is None else arg + 1
+        else:
+            value = arg
+        code |= value << shift
+        shift += ACTION_FIELD_BITS
+    return code
+
+
+def decode_action(code: int) -> tuple:
+    """Unpack an integer action code into the equivalent action tuple."""
+    kind = ACTION_TYPES[code & _OP_MASK]
+    layout = _ACTION_ARGS[kind]
+    payload = code >> ACTION_OP_BITS
+    if layout == "i":
+        return (kind, payload)
+    out: List = [kind]
+    for f in layout:
+        value = payload & _FIELD_MASK
+        payload >>= ACTION_FIELD_BITS
+        if f == "r":
+            out.append(RESOURCES[value])
+        elif f == "p":
+            out.append(None if value == 0 else value - 1)
+        else:
+            out.append(value)
+    return tuple(out)
+
+
+@lru_cache(maxsize=None)
+def _id_actions(kind: str, count: int) -> Tuple[tuple, ...]:
+    """Shared ``(kind, i)`` tuples for i in range(count), indexed by id."""
+    return tuple((kind, i) for i in range(count))
+
+
+# ── Struct-of-arrays view of action lists ──
+# Every distinct action tuple gets a row the first time it is seen; the
+# row holds its ACTION_TYPES index and its arguments as small ints
+# (ids, resource indexes, discard counts; a None steal target and unused
+# slots are -1).  The set of possible actions is finite, so the tables
+# stop growing after warm-up and an action list converts with one dict
+# lookup per action.
+
+ACTION_MAX_ARGS = max(len(layout) for layout in _ACTION_ARGS.values())
+
+
+class _ActionRows(dict):
+    """action tuple -> row index into ``types`` / ``params``."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.types = np.zeros(256, dtype=np.int8)
+        self.params = np.full((256, ACTION_MAX_ARGS), -1, dtype=np.int16)
+
+    def __missing__(self, action: tuple) -> int:
+        row = len(self)
+        if row == len(self.types):
+            self.types = np.concatenate([self.types, np.zeros_like(self.types)])
+            self.params = np.concatenate([self.params, np.full_like(self.params, -1)])
+        kind = action[0]
+        self.types[row] = ACTION_TYPE_IDX[kind]
+        for j, (f, arg) in enumerate(zip(_ACTION_ARGS[kind], action[1:])):
+            if f == "r":
+                self.params[row, j] = RESOURCE_IDX[arg]
+            elif f == "p":
+                self.params[row, j] = -1 if arg is None else arg
+            else:
+                self.params[row, j] = arg
+        self[action] = row
+        return row
+
+
+_ACTION_ROWS = _ActionRows()
+
+
+def action_arrays(actions: List[tuple]) -> Tuple[np.ndarray, np.ndarray]:
+    """Parallel arrays for an action list: (int8[N] type index, int16[N, ACTION_MAX_ARGS] args)."""
+    rows = np.fromiter(map(_ACTION_ROWS.__getitem__, actions), dtype=np.intp, count=len(actions))
+    return _ACTION_ROWS.types[rows], _ACTION_ROWS.params[rows]
 
 
 # ──────────────────────────────────────────────────────────────────────
@@ -855,12 +1540,27 @@ class CatanEnv:
     Actions are plain tuples (see module docstring for the full list).
     """
 
-    def __init__(self, player_count: int = 4):
+    def __init__(
+        self,
+        player_count: int = 4,
+        copy_on_step: bool = True,
+    ):
+        """
+        Args:
+            player_count: 3 or 4.
+            copy_on_step: if True, step() works on a copy so previously
+                returned states stay valid.  Linear rollouts that never look
+                back can pass False to mutate the state in place.
+        """
         if player_count not in (3, 4):
             raise ValueError("player_count must be 3 or 4")
         self._player_count = player_count
+        self._copy_on_step = copy_on_step
         self.state: CatanState = CatanState()
-        self._rng: np.random.RandomState = np.random.RandomState()
+        self._rng: np.random.RandomState = np.random.RandomState()  # board / deck shuffles
+        self._play_rng: np.random.Generator = np.random.default_rng()  # dice and steals
+        self._dice_buf: np.ndarray = np.zeros(0, dtype=np.uint8)
+        self._dice_pos: int = 0
 
     # ── reset ─────────────────────────────────────────────────────
 
@@ -869,6 +1569,9 @@ class CatanEnv:
             self._rng = np.random.RandomState(seed)
         else:
             self._rng = np.random.RandomState()
+        self._play_rng = np.random.default_rng(seed)
+        self._dice_buf = np.zeros(0, dtype=np.uint8)
+        self._dice_pos = 0
 
         topo = build_board_topology()
 
@@ -882,22 +1585,25 @@ class CatanEnv:
         numbers = list(NUMBER_TOKEN_DISTRIBUTION)
         self._rng.shuffle(numbers)
 
-        hex_numbers: List[Optional[int]] = []
-        num_i = 0
-        for t in terrains:
-            if t == "desert":
-                hex_numbers.append(None)
-            else:
-                hex_numbers.append(int(numbers[num_i]))
-                num_i += 1
+        hex_terrains = np.array([TERRAIN_IDX[t] for t in terrains], dtype=np.int8)
+        hex_numbers = np.zeros(len(terrains), dtype=np.int8)  # desert keeps 0
+        hex_numbers[hex_terrains != DESERT_ID] = numbers
 
+        hex_resource_ids = TERRAIN_TO_RESOURCE_ID[hex_terrains]
         harbors = assign_harbors(topo)
 
         # Shuffle dev cards
-        deck = list(DEV_CARD_DISTRIBUTION)
+        deck = _DEV_DECK_TEMPLATE.copy()
         self._rng.shuffle(deck)
 
-        players = [PlayerState(id=i) for i in range(self._player_count)]
+        vertex_setup_grant = build_vertex_setup_grant(topo, hex_resource_ids)
+        vertex_harbor = build_vertex_harbor_map(harbors, topo.vertex_count)
+        # Fixed until the next reset and shared by every CatanState.copy().
+        _freeze(hex_terrains, hex_numbers, hex_resource_ids, vertex_setup_grant,
+                vertex_harbor, deck)
+
+        hands = np.zeros((self._player_count, NUM_RESOURCES), dtype=np.int8)
+        players = [PlayerState(id=i, resources=hands[i]) for i in range(self._player_count)]
 
         self.state = CatanState(
             phase="SETUP_PLACE_SETTLEMENT",
@@ -905,15 +1611,23 @@ class CatanEnv:
             player_count=self._player_count,
             turn_number=0,
             topology=topo,
-            hex_terrains=terrains,
+            hex_terrains=hex_terrains,
             hex_numbers=hex_numbers,
-            vertex_buildings=[None] * topo.vertex_count,
-            edge_roads=[None] * topo.edge_count,
+            hex_resource_ids=hex_resource_ids,
+            vertex_setup_grant=vertex_setup_grant,
+            vertex_building_type=np.zeros(topo.vertex_count, dtype=np.int8),
+            vertex_building_owner=np.full(topo.vertex_count, NO_OWNER, dtype=np.int8),
+            edge_roads=np.full(topo.edge_count, NO_OWNER, dtype=np.int8),
+            player_road_mask=[0] * self._player_count,
+            road_lengths=[0] * self._player_count,
             harbors=harbors,
+            vertex_harbor=vertex_harbor,
             robber_hex=desert_idx,
             players=players,
+            hands=hands,
             dev_card_deck=deck,
-            bank={r: BANK_PER_RESOURCE for r in RESOURCES},
+            dev_card_deck_top=len(deck),
+            bank=_full_bank(),
             longest_road_player=None,
             longest_road_length=0,
             largest_army_player=None,
@@ -940,22 +1654,43 @@ class CatanEnv:
     # ── legal actions ─────────────────────────────────────────────
 
     def get_legal_actions(self) -> List[tuple]:
+        actions: List[tuple] = []
+        self.get_legal_actions_into(actions)
+        return actions
+
+    def get_legal_actions_into(self, out: List[tuple]) -> int:
+        """Fill *out* (cleared first) with the legal actions; return the count.
+
+        Same order as get_legal_actions().  Lets a caller that consumes the
+        list before the next step keep one buffer instead of a new list per
+        call.
+        """
+        out.clear()
+        self._fill_legal_actions(out)
+        return len(out)
+
+    def _fill_legal_actions(self, out: List[tuple]) -> None:
+        """Append the legal actions for the current state to *out*."""
         s = self.state
         phase = s.phase
+        topo = s.topology
 
         if phase == "GAME_OVER":
-            return []
+            return
 
         if phase == "SETUP_PLACE_SETTLEMENT":
-            verts = get_valid_setup_settlement_vertices(s)
-            return [("PLACE_SETUP_SETTLEMENT", v) for v in verts]
+            table = _id_actions("PLACE_SETUP_SETTLEMENT", topo.vertex_count)
+            out.extend([table[v] for v in get_valid_setup_settlement_vertices(s)])
+            return
 
         if phase == "SETUP_PLACE_ROAD":
-            edges = get_valid_setup_road_edges(s)
-            return [("PLACE_SETUP_ROAD", e) for e in edges]
+            table = _id_actions("PLACE_SETUP_ROAD", topo.edge_count)
+            out.extend([table[e] for e in get_valid_setup_road_edges(s)])
+            return
 
         if phase == "ROLL_DICE":
-            return [("ROLL_DICE",)]
+            out.append(("ROLL_DICE",))
+            return
 
         if phase == "DISCARD":
             # The first player in the needing-discard list acts.
@@ -963,108 +1698,122 @@ class CatanEnv:
             p = s.players[pid]
             total = _total_resources(p.resources)
             discard_count = total // 2
-            return self._enumerate_discard(p.resources, discard_count)
+            out.extend(self._enumerate_discard(p.resources, discard_count))
+            return
 
         if phase == "MOVE_ROBBER":
-            hexes = get_valid_robber_hexes(s)
-            return [("MOVE_ROBBER", h) for h in hexes]
+            table = _id_actions("MOVE_ROBBER", len(topo.hex_coords))
+            out.extend([table[h] for h in get_valid_robber_hexes(s)])
+            return
 
         if phase == "STEAL":
             targets = get_steal_targets(s, s.robber_hex, s.current_player)
             if not targets:
-                return [("STEAL_RESOURCE", None)]
-            return [("STEAL_RESOURCE", t) for t in targets]
+                out.append(("STEAL_RESOURCE", None))
+            else:
+                out.extend([("STEAL_RESOURCE", t) for t in targets])
+            return
 
         if phase == "TRADE_BUILD_PLAY":
-            return self._trade_build_play_actions()
+            self._trade_build_play_actions(out)
+            return
 
         if phase == "ROAD_BUILDING_PLACE":
+            table = _id_actions("PLACE_ROAD_BUILDING_ROAD", topo.edge_count)
             edges = get_valid_road_edges_no_resource_check(s, s.current_player)
-            return [("PLACE_ROAD_BUILDING_ROAD", e) for e in edges]
+            out.extend([table[e] for e in edges])
+            return
 
         if phase == "YEAR_OF_PLENTY_PICK":
-            actions: List[tuple] = []
-            for i, r1 in enumerate(RESOURCES):
-                for r2 in RESOURCES[i:]:
-                    # bank check
-                    if r1 == r2:
-                        if s.bank[r1] >= 2:
-                            actions.append(("PICK_YEAR_OF_PLENTY_RESOURCES", r1, r2))
-                    else:
-                        if s.bank[r1] >= 1 and s.bank[r2] >= 1:
-                            actions.append(("PICK_YEAR_OF_PLENTY_RESOURCES", r1, r2))
-            return actions
+            bank = s.bank.tolist()
+            out.extend(_year_of_plenty_actions(
+                _resource_bits([n >= 1 for n in bank]),
+                _resource_bits([n >= 2 for n in bank]),
+            ))
+            return
 
         if phase == "MONOPOLY_PICK":
-            return [("PICK_MONOPOLY_RESOURCE", r) for r in RESOURCES]
+            out.extend([("PICK_MONOPOLY_RESOURCE", r) for r in RESOURCES])
 
-        return []
+    def get_legal_actions_arrays(self) -> Tuple[np.ndarray, np.ndarray, List[tuple]]:
+        """(types, params, actions): the legal actions plus their action_arrays() view."""
+        actions = self.get_legal_actions()
+        types, params = action_arrays(actions)
+        return types, params, actions
 
     # -- sub-enumerators --
 
-    def _trade_build_play_actions(self) -> List[tuple]:
+    def _trade_build_play_actions(self, out: List[tuple]) -> None:
         s = self.state
         pid = s.current_player
-        actions: List[tuple] = []
+        topo = s.topology
 
         # Build road
-        for eid in get_valid_road_edges(s, pid):
-            actions.append(("BUILD_ROAD", eid))
+        table = _id_actions("BUILD_ROAD", topo.edge_count)
+        out.extend([table[e] for e in get_valid_road_edges(s, pid)])
 
         # Build settlement
-        for vid in get_valid_settlement_vertices(s, pid):
-            actions.append(("BUILD_SETTLEMENT", vid))
+        table = _id_actions("BUILD_SETTLEMENT", topo.vertex_count)
+        out.extend([table[v] for v in get_valid_settlement_vertices(s, pid)])
 
         # Build city
-        for vid in get_valid_city_vertices(s, pid):
-            actions.append(("BUILD_CITY", vid))
+        table = _id_actions("BUILD_CITY", topo.vertex_count)
+        out.extend([table[v] for v in get_valid_city_vertices(s, pid)])
 
         # Buy dev card
         if can_buy_dev_card(s, pid):
-            actions.append(("BUY_DEV_CARD",))
+            out.append(("BUY_DEV_CARD",))
 
         # Play dev cards
         if can_play_dev_card(s, pid, "knight"):
-            actions.append(("PLAY_KNIGHT",))
+            out.append(("PLAY_KNIGHT",))
         if can_play_dev_card(s, pid, "road_building"):
-            actions.append(("PLAY_ROAD_BUILDING",))
+            out.append(("PLAY_ROAD_BUILDING",))
         if can_play_dev_card(s, pid, "year_of_plenty"):
-            actions.append(("PLAY_YEAR_OF_PLENTY",))
+            out.append(("PLAY_YEAR_OF_PLENTY",))
         if can_play_dev_card(s, pid, "monopoly"):
-            actions.append(("PLAY_MONOPOLY",))
+            out.append(("PLAY_MONOPOLY",))
 
-        # Maritime trade
-        for give in RESOURCES:
-            for receive in RESOURCES:
-                if is_valid_maritime_trade(s, pid, give, receive):
-                    actions.append(("MARITIME_TRADE", give, receive))
+        # Maritime trade (same rule as is_valid_maritime_trade, as two masks)
+        hand = s.hands[pid].tolist()
+        ratios = _get_player_trade_ratios(s, pid).tolist()
+        give_bits = _resource_bits([h >= r for h, r in zip(hand, ratios)])
+        if give_bits:
+            receive_bits = _resource_bits([n > 0 for n in s.bank.tolist()])
+            out.extend(_maritime_trade_actions(give_bits, receive_bits))
 
         # End turn (always legal in TRADE_BUILD_PLAY)
-        actions.append(("END_TURN",))
-
-        return actions
+        out.append(("END_TURN",))
 
     @staticmethod
-    def _enumerate_discard(hand: Dict[str, int], count: int) -> List[tuple]:
+    def _enumerate_discard(hand: np.ndarray, count: int) -> List[tuple]:
         """Enumerate all ways to discard exactly *count* cards from *hand*.
 
         Returns action tuples of form ('DISCARD_RESOURCES', l, b, w, g, o).
         For very large hands this can be expensive; that's fine for training.
         """
+        if HAS_NUMBA:
+            rows = CatanEnv._discard_rows(hand, count)
+            return [("DISCARD_RESOURCES",) + row for row in map(tuple, rows.tolist())]
+
+        counts = [int(c) for c in hand]  # order: lumber, brick, wool, grain, ore
         results: List[tuple] = []
-        res = RESOURCES  # order: lumber, brick, wool, grain, ore
+        # suffix[i] = cards held in resources i.. (for pruning)
+        suffix = [0] * (NUM_RESOURCES + 1)
+        for i in range(NUM_RESOURCES - 1, -1, -1):
+            suffix[i] = suffix[i + 1] + counts[i]
 
         def _recurse(idx: int, remaining: int, chosen: List[int]) -> None:
-            if idx == len(res):
+            if idx == NUM_RESOURCES:
                 if remaining == 0:
                     results.append(("DISCARD_RESOURCES",) + tuple(chosen))
                 return
-            max_take = min(hand[res[idx]], remaining)
+            max_take = min(counts[idx], remaining)
+            max_possible = suffix[idx + 1]
             for take in range(max_take + 1):
                 # Prune: even if we take max of everything remaining,
                 # can we still reach the target?
                 left_after = remaining - take
-                max_possible = sum(hand[res[j]] for j in range(idx + 1, len(res)))
                 if left_after > max_possible:
                     continue
                 _recurse(idx + 1, left_after, chosen + [take])
@@ -1072,95 +1821,41 @@ class CatanEnv:
         _recurse(0, count, [])
         return results
 
+    @staticmethod
+    def _discard_rows(hand: np.ndarray, count: int) -> np.ndarray:
+        """int8[n, NUM_RESOURCES] discard choices, in _enumerate_discard order."""
+        if not HAS_NUMBA:
+            actions = CatanEnv._enumerate_discard(hand, count)
+            return np.array([a[1:] for a in actions], dtype=np.int8).reshape(-1, NUM_RESOURCES)
+        counts = hand.astype(np.int64)
+        # One row per choice of the first four columns bounds the output
+        bound = 1
+        for c in counts[:NUM_RESOURCES - 1].tolist():
+            bound *= min(c, count) + 1
+        out = np.empty((bound, NUM_RESOURCES), dtype=np.int8)
+        n = _enumerate_discard_numba(counts, count, out)
+        return out[:n]
+
     # ── step ──────────────────────────────────────────────────────
 
-    def step(self, action: tuple) -> Tuple[CatanState, float, bool, dict]:
-        """Apply *action*, return (new_state, reward, done, info).
+    def step(self, action: Union[tuple, int]) -> Tuple[CatanState, float, bool, dict]:
+        """Apply *action* (tuple or integer code), return (new_state, reward, done, info).
 
         Reward is +1 for the winning player, -1 for all others on game end,
         and 0 otherwise.
         """
-        s = self.state  # we mutate a copy
-        s = s.copy()
-        self.state = s
-
-        action_type = action[0]
-        info: dict = {}
-
-        # ── SETUP ──
-        if action_type == "PLACE_SETUP_SETTLEMENT":
-            vertex = action[1]
-            self._apply_setup_settlement(vertex)
-
-        elif action_type == "PLACE_SETUP_ROAD":
-            edge = action[1]
-            self._apply_setup_road(edge)
-
-        # ── ROLL DICE ──
-        elif action_type == "ROLL_DICE":
-            self._apply_roll_dice()
-
-        # ── DISCARD ──
-        elif action_type == "DISCARD_RESOURCES":
-            # ('DISCARD_RESOURCES', l, b, w, g, o)
-            resources = {RESOURCES[i]: action[i + 1] for i in range(5)}
-            self._apply_discard(resources)
-
-        # ── ROBBER ──
-        elif action_type == "MOVE_ROBBER":
-            self._apply_move_robber(action[1])
-
-        elif action_type == "STEAL_RESOURCE":
-            self._apply_steal(action[1])
-
-        # ── BUILD ──
-        elif action_type == "BUILD_ROAD":
-            self._apply_build_road(s.current_player, action[1], free=False)
-            update_longest_road(s)
-
-        elif action_type == "BUILD_SETTLEMENT":
-            self._apply_build_settlement(action[1])
-            update_longest_road(s)
-
-        elif action_type == "BUILD_CITY":
-            self._apply_build_city(action[1])
-
-        # ── DEV CARDS ──
-        elif action_type == "BUY_DEV_CARD":
-            self._apply_buy_dev_card()
-
-        elif action_type == "PLAY_KNIGHT":
-            self._apply_play_knight()
-
-        elif action_type == "PLAY_ROAD_BUILDING":
-            self._apply_play_road_building()
-
-        elif action_type == "PLACE_ROAD_BUILDING_ROAD":
-            self._apply_place_road_building_road(action[1])
-
-        elif action_type == "PLAY_YEAR_OF_PLENTY":
-            self._apply_play_year_of_plenty()
-
-        elif action_type == "PICK_YEAR_OF_PLENTY_RESOURCES":
-            self._apply_pick_yop(action[1], action[2])
-
-        elif action_type == "PLAY_MONOPOLY":
-            self._apply_play_monopoly()
-
-        elif action_type == "PICK_MONOPOLY_RESOURCE":
-            self._apply_pick_monopoly(action[1])
-
-        # ── TRADE ──
-        elif action_type == "MARITIME_TRADE":
-            self._apply_maritime_trade(action[1], action[2])
-
-        # ── END TURN ──
-        elif action_type == "END_TURN":
-            self._apply_end_turn()
+        if self._copy_on_step:
+            self.state = self.state.copy()  # earlier states stay untouched
+        s = self.state
 
-        else:
-            raise ValueError(f"Unknown action type: {action_type}")
+        if not isinstance(action, tuple):
+            action = decode_action(int(action))
+        handler = self._HANDLERS.get(action[0])
+        if handler is None:
+            raise ValueError(f"Unknown action type: {action[0]}")
+        handler(self, *action[1:])
 
+        info: dict = {}
         done = s.phase == "GAME_OVER"
         reward = 0.0
         if done:
@@ -1169,21 +1864,33 @@ class CatanEnv:
 
     # ── action implementations (mutate self.state in place) ──
 
+    def _step_discard(self, *counts: int) -> None:
+        # ('DISCARD_RESOURCES', l, b, w, g, o)
+        self._apply_discard(np.array(counts, dtype=np.int8))
+
+    def _step_build_road(self, edge: int) -> None:
+        self._apply_build_road(self.state.current_player, edge, free=False)
+        update_longest_road(self.state)
+
+    def _step_build_settlement(self, vertex: int) -> None:
+        self._apply_build_settlement(vertex)
+        update_longest_road(self.state)
+
     def _apply_setup_settlement(self, vertex: int) -> None:
         s = self.state
         pid = s.current_player
-        s.vertex_buildings[vertex] = ("settlement", pid)
+        s.vertex_building_type[vertex] = BUILDING_SETTLEMENT
+        s.vertex_building_owner[vertex] = pid
+        s.occupied_vertex_mask |= 1 << vertex
+        s._build_version += 1
+        _settlement_placed(s, vertex, pid)
         s.players[pid].remaining_settlements -= 1
 
         # Second round: grant resources from adjacent hexes
         if s.setup_round == 1:
-            topo = s.topology
-            assert topo is not None
-            for hid in topo.vertex_adjacent_hexes[vertex]:
-                res = TERRAIN_TO_RESOURCE.get(s.hex_terrains[hid])
-                if res is not None:
-                    s.players[pid].resources[res] += 1
-                    s.bank[res] -= 1
+            grant = s.vertex_setup_grant[vertex]
+            s.hands[pid] += grant
+            s.bank -= grant
 
         s.last_placed_vertex = vertex
         s.phase = "SETUP_PLACE_ROAD"
@@ -1192,6 +1899,8 @@ class CatanEnv:
         s = self.state
         pid = s.current_player
         s.edge_roads[edge] = pid
+        s.player_road_mask[pid] |= 1 << edge
+        _road_placed(s, pid)
         s.players[pid].remaining_roads -= 1
 
         order = get_setup_order(s.player_count)
@@ -1212,16 +1921,18 @@ class CatanEnv:
 
     def _apply_roll_dice(self) -> None:
         s = self.state
-        d1 = int(self._rng.randint(1, 7))  # [1,6]
-        d2 = int(self._rng.randint(1, 7))
+        pos = self._dice_pos
+        if pos + 2 > len(self._dice_buf):
+            self._dice_buf = self._play_rng.integers(1, 7, size=_DICE_BUFFER_SIZE, dtype=np.uint8)
+            pos = 0
+        d1 = int(self._dice_buf[pos])  # [1,6]
+        d2 = int(self._dice_buf[pos + 1])
+        self._dice_pos = pos + 2
         total = d1 + d2
         s.last_roll = (d1, d2)
 
         if total == 7:
-            need = [
-                pid for pid in range(s.player_count)
-                if _total_resources(s.players[pid].resources) > 7
-            ]
+            need = (s.hands.sum(axis=1) > 7).nonzero()[0].tolist()
             if need:
                 s.phase = "DISCARD"
                 s.players_needing_discard = need
@@ -1231,13 +1942,11 @@ class CatanEnv:
             _distribute_resources(s, total)
             s.phase = "TRADE_BUILD_PLAY"
 
-    def _apply_discard(self, resources: Dict[str, int]) -> None:
+    def _apply_discard(self, resources: np.ndarray) -> None:
         s = self.state
         pid = s.players_needing_discard[0]
-        p = s.players[pid]
-        for r in RESOURCES:
-            p.resources[r] -= resources[r]
-            s.bank[r] += resources[r]
+        s.players[pid].resources -= resources
+        s.bank += resources
 
         s.players_needing_discard = s.players_needing_discard[1:]
         if not s.players_needing_discard:
@@ -1255,67 +1964,71 @@ class CatanEnv:
             s.phase = "TRADE_BUILD_PLAY"
             return
 
-        v_res = s.players[victim].resources
-        available: List[str] = []
-        for r in RESOURCES:
-            available.extend([r] * v_res[r])
-
-        if not available:
+        hand = s.hands[victim].tolist()
+        total = sum(hand)
+        if total == 0:
             s.phase = "TRADE_BUILD_PLAY"
             return
 
-        idx = int(self._rng.randint(0, len(available)))
-        stolen = available[idx]
-        s.players[victim].resources[stolen] -= 1
-        s.players[s.current_player].resources[stolen] += 1
+        # Uniform over the victim's cards: walk the per-resource counts
+        pick = int(self._play_rng.integers(total))
+        stolen = 0
+        while pick >= hand[stolen]:
+            pick -= hand[stolen]
+            stolen += 1
+        s.hands[victim, stolen] -= 1
+        s.hands[s.current_player, stolen] += 1
         s.phase = "TRADE_BUILD_PLAY"
 
     def _apply_build_road(self, player: int, edge: int, free: bool = False) -> None:
         s = self.state
         s.edge_roads[edge] = player
+        s.player_road_mask[player] |= 1 << edge
+        _road_placed(s, player)
         p = s.players[player]
         p.remaining_roads -= 1
         if not free:
-            for r in RESOURCES:
-                p.resources[r] -= ROAD_COST[r]
-                s.bank[r] += ROAD_COST[r]
+            p.resources -= ROAD_COST_ARR
+            s.bank += ROAD_COST_ARR
 
     def _apply_build_settlement(self, vertex: int) -> None:
         s = self.state
         pid = s.current_player
-        s.vertex_buildings[vertex] = ("settlement", pid)
+        s.vertex_building_type[vertex] = BUILDING_SETTLEMENT
+        s.vertex_building_owner[vertex] = pid
+        s.occupied_vertex_mask |= 1 << vertex
+        s._build_version += 1
+        _settlement_placed(s, vertex, pid)
         p = s.players[pid]
         p.remaining_settlements -= 1
-        for r in RESOURCES:
-            p.resources[r] -= SETTLEMENT_COST[r]
-            s.bank[r] += SETTLEMENT_COST[r]
+        p.resources -= SETTLEMENT_COST_ARR
+        s.bank += SETTLEMENT_COST_ARR
 
     def _apply_build_city(self, vertex: int) -> None:
         s = self.state
         pid = s.current_player
-        s.vertex_buildings[vertex] = ("city", pid)
+        s.vertex_building_type[vertex] = BUILDING_CITY
+        s._build_version += 1
         p = s.players[pid]
         p.remaining_cities -= 1
         p.remaining_settlements += 1  # settlement returned
-        for r in RESOURCES:
-            p.resources[r] -= CITY_COST[r]
-            s.bank[r] += CITY_COST[r]
+        p.resources -= CITY_COST_ARR
+        s.bank += CITY_COST_ARR
 
     def _apply_buy_dev_card(self) -> None:
         s = self.state
         pid = s.current_player
-        card = s.dev_card_deck.pop()
+        s.dev_card_deck_top -= 1
         p = s.players[pid]
-        for r in RESOURCES:
-            p.resources[r] -= DEV_CARD_COST[r]
-            s.bank[r] += DEV_CARD_COST[r]
-        p.new_dev_cards.append(card)
+        p.resources -= DEV_CARD_COST_ARR
+        s.bank += DEV_CARD_COST_ARR
+        p.new_dev_cards[s.dev_card_deck[s.dev_card_deck_top]] += 1
 
     def _apply_play_knight(self) -> None:
         s = self.state
         pid = s.current_player
         p = s.players[pid]
-        p.dev_cards = _remove_dev_card(p.dev_cards, "knight")
+        p.dev_cards[KNIGHT_ID] -= 1
         p.knights_played += 1
         p.has_played_dev_card_this_turn = True
         update_largest_army(s)
@@ -1325,7 +2038,7 @@ class CatanEnv:
         s = self.state
         pid = s.current_player
         p = s.players[pid]
-        p.dev_cards = _remove_dev_card(p.dev_cards, "road_building")
+        p.dev_cards[ROAD_BUILDING_ID] -= 1
         p.has_played_dev_card_this_turn = True
         roads_to_place = min(2, p.remaining_roads)
         if roads_to_place == 0:
@@ -1353,7 +2066,7 @@ class CatanEnv:
         s = self.state
         pid = s.current_player
         p = s.players[pid]
-        p.dev_cards = _remove_dev_card(p.dev_cards, "year_of_plenty")
+        p.dev_cards[YEAR_OF_PLENTY_ID] -= 1
         p.has_played_dev_card_this_turn = True
         s.phase = "YEAR_OF_PLENTY_PICK"
 
@@ -1361,43 +2074,41 @@ class CatanEnv:
         s = self.state
         pid = s.current_player
         p = s.players[pid]
-        p.resources[r1] += 1
-        p.resources[r2] += 1
-        s.bank[r1] -= 1
-        s.bank[r2] -= 1
+        i1, i2 = RESOURCE_IDX[r1], RESOURCE_IDX[r2]
+        p.resources[i1] += 1
+        p.resources[i2] += 1
+        s.bank[i1] -= 1
+        s.bank[i2] -= 1
         s.phase = "TRADE_BUILD_PLAY"
 
     def _apply_play_monopoly(self) -> None:
         s = self.state
         pid = s.current_player
         p = s.players[pid]
-        p.dev_cards = _remove_dev_card(p.dev_cards, "monopoly")
+        p.dev_cards[MONOPOLY_ID] -= 1
         p.has_played_dev_card_this_turn = True
         s.phase = "MONOPOLY_PICK"
 
     def _apply_pick_monopoly(self, resource: str) -> None:
         s = self.state
         pid = s.current_player
-        total_stolen = 0
-        for i in range(s.player_count):
-            if i == pid:
-                continue
-            amount = s.players[i].resources[resource]
-            if amount > 0:
-                total_stolen += amount
-                s.players[i].resources[resource] = 0
-        s.players[pid].resources[resource] += total_stolen
+        ridx = RESOURCE_IDX[resource]
+        stolen = s.hands[:, ridx].copy()
+        stolen[pid] = 0
+        s.hands[:, ridx] -= stolen
+        s.hands[pid, ridx] += stolen.sum()
         s.phase = "TRADE_BUILD_PLAY"
 
     def _apply_maritime_trade(self, give: str, receive: str) -> None:
         s = self.state
         pid = s.current_player
         ratio = _get_player_trade_ratio(s, pid, give)
+        gi, ri = RESOURCE_IDX[give], RESOURCE_IDX[receive]
         p = s.players[pid]
-        p.resources[give] -= ratio
-        p.resources[receive] += 1
-        s.bank[give] += ratio
-        s.bank[receive] -= 1
+        p.resources[gi] -= ratio
+        p.resources[ri] += 1
+        s.bank[gi] += ratio
+        s.bank[ri] -= 1
 
     def _apply_end_turn(self) -> None:
         s = self.state
@@ -1405,8 +2116,8 @@ class CatanEnv:
         p = s.players[pid]
 
         # Promote new dev cards
-        p.dev_cards.extend(p.new_dev_cards)
-        p.new_dev_cards = []
+        p.dev_cards += p.new_dev_cards
+        p.new_dev_cards.fill(0)
         p.has_played_dev_card_this_turn = False
 
         # Check victory
@@ -1421,6 +2132,34 @@ class CatanEnv:
         s.last_roll = None
         s.phase = "ROLL_DICE"
 
+    # action type -> handler(self, *payload); step() dispatches through this
+    _HANDLERS: Dict[str, Callable[..., None]] = {
+        # Setup
+        "PLACE_SETUP_SETTLEMENT": _apply_setup_settlement,
+        "PLACE_SETUP_ROAD": _apply_setup_road,
+        # Dice / discard / robber
+        "ROLL_DICE": _apply_roll_dice,
+        "DISCARD_RESOURCES": _step_discard,
+        "MOVE_ROBBER": _apply_move_robber,
+        "STEAL_RESOURCE": _apply_steal,
+        # Build
+        "BUILD_ROAD": _step_build_road,
+        "BUILD_SETTLEMENT": _step_build_settlement,
+        "BUILD_CITY": _apply_build_city,
+        # Dev cards
+        "BUY_DEV_CARD": _apply_buy_dev_card,
+        "PLAY_KNIGHT": _apply_play_knight,
+        "PLAY_ROAD_BUILDING": _apply_play_road_building,
+        "PLACE_ROAD_BUILDING_ROAD": _apply_place_road_building_road,
+        "PLAY_YEAR_OF_PLENTY": _apply_play_year_of_plenty,
+        "PICK_YEAR_OF_PLENTY_RESOURCES": _apply_pick_yop,
+        "PLAY_MONOPOLY": _apply_play_monopoly,
+        "PICK_MONOPOLY_RESOURCE": _apply_pick_monopoly,
+        # Trade / turn
+        "MARITIME_TRADE": _apply_maritime_trade,
+        "END_TURN": _apply_end_turn,
+    }
+
 
 # ──────────────────────────────────────────────────────────────────────
 #  Quick smoke test
@@ -1448,7 +2187,7 @@ if __name__ == "__main__":
         state, reward, done, info = env.step(action)
         step_count += 1
         if step_count % 200 == 0:
-            vps = [calculate_vp(state, p) for p in range(state.player_count)]
+            vps = calculate_all_vps(state).tolist()
             print(f"Step {step_count}: phase={state.phase} turn={state.turn_number} VPs={vps}")
         if step_count > 10000:
             print("Stopping after 10000 steps (game not over).")
@@ -1456,7 +2195,7 @@ if __name__ == "__main__":
 
     if done:
         print(f"Game over after {step_count} steps.  Winner: player {state.winner}")
-        for p in range(state.player_count):
-            print(f"  Player {p}: {calculate_vp(state, p)} VP")
+        for p, vp in enumerate(calculate_all_vps(state).tolist()):
+            print(f"  Player {p}: {vp} VP")
     else:
         print(f"Game still running after {step_count} steps in phase {state.phase}")
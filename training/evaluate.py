@@ -12,40 +12,81 @@ Usage:
 from __future__ import annotations
 
 import argparse
+import multiprocessing
 import os
 import sys
 import time
-from collections import defaultdict
 
 import numpy as np
 import torch
 from torch.distributions import Categorical
 
-from model import PolicyValueNet, CatanMLP, INPUT_SIZE
-from feature_extractor import extract_features, TOTAL_FEATURES
+from model import PolicyValueNet, CatanMLP, INPUT_SIZE, compile_for_inference
+from feature_extractor import extract_features_batch, TOTAL_FEATURES
 from catan_env import (
+    ACTION_TYPE_IDX,
+    ACTION_TYPES,
     CatanEnv,
     CatanState,
     calculate_vp,
-    TERRAIN_TO_RESOURCE,
     RESOURCES,
+    action_arrays,
 )
+from numba_compat import HAS_NUMBA, njit
 
 
 # ---- Opponent strategies ----
 
 PIP_COUNTS = {2: 1, 3: 2, 4: 3, 5: 4, 6: 5, 8: 5, 9: 4, 10: 3, 11: 2, 12: 1}
+PIP_LUT = np.zeros(13, dtype=np.int8)  # [token] -> pips; 0 for no token
+for _token, _pips in PIP_COUNTS.items():
+    PIP_LUT[_token] = _pips
+_PIP_LIST = PIP_LUT.tolist()  # for scalar lookups (no NumPy scalar boxing)
+
+# HeuristicOpponent score per action type: base + jitter * U[0, 1).
+# Building priorities: city > settlement > knight > dev card > other dev
+# cards > road > trade > end turn.  PLACE_SETUP_SETTLEMENT and
+# STEAL_RESOURCE depend on the action argument and are scored separately.
+_HEURISTIC_SCORES: dict[str, tuple[float, float]] = {
+    "PLACE_SETUP_ROAD": (10.0, 1.0),
+    "BUILD_CITY": (80.0, 0.0),
+    "BUILD_SETTLEMENT": (60.0, 0.0),
+    "BUY_DEV_CARD": (40.0, 0.0),
+    "BUILD_ROAD": (20.0, 0.0),
+    "PLAY_KNIGHT": (45.0, 0.0),
+    "PLAY_ROAD_BUILDING": (35.0, 0.0),
+    "PLAY_YEAR_OF_PLENTY": (35.0, 0.0),
+    "PLAY_MONOPOLY": (35.0, 0.0),
+    "MARITIME_TRADE": (15.0, 0.0),
+    "MOVE_ROBBER": (10.0, 5.0),
+    "PICK_YEAR_OF_PLENTY_RESOURCES": (10.0, 1.0),
+    "PICK_MONOPOLY_RESOURCE": (10.0, 1.0),
+    "DISCARD_RESOURCES": (0.0, 1.0),
+    "PLACE_ROAD_BUILDING_ROAD": (10.0, 1.0),
+    "END_TURN": (-1.0, 0.0),
+    "ROLL_DICE": (100.0, 0.0),
+}
+HEURISTIC_BASE_SCORES = np.zeros(len(ACTION_TYPES))
+HEURISTIC_JITTER = np.zeros(len(ACTION_TYPES))
+for _kind, (_base, _jitter) in _HEURISTIC_SCORES.items():
+    HEURISTIC_BASE_SCORES[ACTION_TYPE_IDX[_kind]] = _base
+    HEURISTIC_JITTER[ACTION_TYPE_IDX[_kind]] = _jitter
+_SETUP_SETTLEMENT_CODE = ACTION_TYPE_IDX["PLACE_SETUP_SETTLEMENT"]
+_STEAL_CODE = ACTION_TYPE_IDX["STEAL_RESOURCE"]
 
 
 class RandomOpponent:
     """Picks a random legal action each turn."""
 
+    def __init__(self, seed: int | np.random.SeedSequence | None = None) -> None:
+        self.rng = np.random.default_rng(seed)
+
     def choose_action(
         self, state: CatanState, legal_actions: list[tuple], player: int
     ) -> tuple:
         if len(legal_actions) == 0:
             raise ValueError("No legal actions available")
-        idx = np.random.randint(len(legal_actions))
+        idx = self.rng.integers(len(legal_actions))
         return legal_actions[idx]
 
 
@@ -57,6 +98,9 @@ class HeuristicOpponent:
               maritime trade > end turn.
     """
 
+    def __init__(self, seed: int | np.random.SeedSequence | None = None) -> None:
+        self.rng = np.random.default_rng(seed)
+
     def choose_action(
         self, state: CatanState, legal_actions: list[tuple], player: int
     ) -> tuple:
@@ -65,99 +109,72 @@ class HeuristicOpponent:
         if len(legal_actions) == 1:
             return legal_actions[0]
 
-        # Score each action
-        scored = [
-            (self._score_action(a, state, player), i)
-            for i, a in enumerate(legal_actions)
-        ]
-        scored.sort(key=lambda x: -x[0])  # highest score first
-
-        # Add a small random tiebreaker
-        best_score = scored[0][0]
-        candidates = [idx for score, idx in scored if score >= best_score - 1.0]
-        chosen_idx = candidates[np.random.randint(len(candidates))]
+        scores = self._score_actions(legal_actions, state)
+        candidates = np.flatnonzero(scores >= scores.max() - 1.0)
+        chosen_idx = candidates[self.rng.integers(len(candidates))]
         return legal_actions[chosen_idx]
 
-    def _score_action(self, action: tuple, state: CatanState, player: int) -> float:
-        action_type = action[0]
+    def _score_actions(self, legal_actions: list[tuple], state: CatanState) -> np.ndarray:
+        """Score every legal action; higher is better."""
+        codes, params = action_arrays(legal_actions)
+        scores = HEURISTIC_BASE_SCORES[codes]
+        jitter = HEURISTIC_JITTER[codes]
+        noisy = jitter.nonzero()[0]
+        if len(noisy):
+            scores[noisy] += jitter[noisy] * self.rng.random(len(noisy))
 
         # Setup: score by production pips at the vertex
-        if action_type == "PLACE_SETUP_SETTLEMENT":
-            return self._score_setup_vertex(state, action[1])
-        if action_type == "PLACE_SETUP_ROAD":
-            return 10.0 + np.random.random()
-
-        # Building priorities
-        if action_type == "BUILD_CITY":
-            return 80.0
-        if action_type == "BUILD_SETTLEMENT":
-            return 60.0
-        if action_type == "BUY_DEV_CARD":
-            return 40.0
-        if action_type == "BUILD_ROAD":
-            return 20.0
-
-        # Dev card plays
-        if action_type == "PLAY_KNIGHT":
-            return 45.0
-        if action_type in (
-            "PLAY_ROAD_BUILDING", "PLAY_YEAR_OF_PLENTY", "PLAY_MONOPOLY"
-        ):
-            return 35.0
-
-        # Maritime trade
-        if action_type == "MARITIME_TRADE":
-            return 15.0
-
-        # Robber
-        if action_type == "MOVE_ROBBER":
-            return 10.0 + np.random.random() * 5
-
-        # Steal
-        if action_type == "STEAL_RESOURCE":
-            return 10.0 if action[1] is not None else 0.0
-
-        # Year of plenty / monopoly picks
-        if action_type == "PICK_YEAR_OF_PLENTY_RESOURCES":
-            return 10.0 + np.random.random()
-        if action_type == "PICK_MONOPOLY_RESOURCE":
-            return 10.0 + np.random.random()
-
-        # Discard
-        if action_type == "DISCARD_RESOURCES":
-            return np.random.random()
-
-        # Road building placement
-        if action_type == "PLACE_ROAD_BUILDING_ROAD":
-            return 10.0 + np.random.random()
-
-        # End turn (lowest priority)
-        if action_type == "END_TURN":
-            return -1.0
-
-        # Roll dice
-        if action_type == "ROLL_DICE":
-            return 100.0
-
-        return 0.0
+        setup = (codes == _SETUP_SETTLEMENT_CODE).nonzero()[0]
+        if len(setup) and HAS_NUMBA:
+            topo = state.topology
+            scores[setup] = _setup_vertex_scores(
+                params[setup, 0], topo.vah_indices, topo.vah_offsets,
+                state.hex_numbers, state.hex_resource_ids, PIP_LUT,
+            )
+        else:
+            for i in setup.tolist():
+                scores[i] = self._score_setup_vertex(state, int(params[i, 0]))
+
+        # Stealing from a player (target >= 0); from nobody keeps base 0
+        scores[(codes == _STEAL_CODE) & (params[:, 0] >= 0)] = 10.0
+        return scores
 
     def _score_setup_vertex(self, state: CatanState, vertex: int) -> float:
         """Score a setup vertex by pip count of adjacent hexes."""
         topo = state.topology
         assert topo is not None
         total_pips = 0
-        resource_types: set[str] = set()
+        resource_types: set[int] = set()
         for hid in topo.vertex_adjacent_hexes[vertex]:
-            token = state.hex_numbers[hid]
-            if token is not None:
-                total_pips += PIP_COUNTS.get(token, 0)
-            terrain = state.hex_terrains[hid]
-            res = TERRAIN_TO_RESOURCE.get(terrain)
-            if res is not None:
+            total_pips += _PIP_LIST[state.hex_numbers[hid]]  # 0 = no token
+            res = int(state.hex_resource_ids[hid])  # -1 = desert
+            if res >= 0:
                 resource_types.add(res)
         return total_pips * 10.0 + len(resource_types) * 15.0
 
 
+@njit(cache=True)
+def _setup_vertex_scores(vertices, vah_indices, vah_offsets, hex_numbers, hex_resource_ids, pip_lut):
+    """HeuristicOpponent._score_setup_vertex for many vertices (CSR vertex -> hexes)."""
+    out = np.empty(len(vertices), dtype=np.float64)
+    for k in range(len(vertices)):
+        v = vertices[k]
+        pips = 0
+        resource_mask = 0
+        for j in range(vah_offsets[v], vah_offsets[v + 1]):
+            hid = vah_indices[j]
+            pips += pip_lut[hex_numbers[hid]]
+            res = hex_resource_ids[hid]  # -1 = desert
+            if res >= 0:
+                resource_mask |= 1 << res
+        kinds = 0
+        while resource_mask:
+            kinds += resource_mask & 1
+            resource_mask >>= 1
+        out[k] = pips * 10.0 + kinds * 15.0
+    return out
+
+
 class NeuralOpponent:
     """Neural network opponent using a PolicyValueNet."""
 
@@ -166,44 +183,285 @@ class NeuralOpponent:
         model: PolicyValueNet,
         device: torch.device,
         max_actions: int = 200,
+        input_dtype: torch.dtype = torch.float32,
     ):
         self.model = model
         self.device = device
         self.max_actions = max_actions
+        self.input_dtype = input_dtype  # dtype of the model's weights
+        self._action_slots = torch.arange(max_actions, device=device)
+        self._capacity = 0
+        self._reserve(1)
+
+    def _reserve(self, rows: int) -> None:
+        """(Re)allocate the feature buffers to hold at least *rows* decisions.
+
+        Features are written straight into a host tensor (pinned when the
+        model is on CUDA, so the copy can be asynchronous) through a NumPy
+        view.  On CPU that host tensor is the model input itself.
+        """
+        capacity = max(rows, 2 * self._capacity)
+        pin = self.device.type == "cuda"
+        self._host_buf = torch.empty(
+            capacity, TOTAL_FEATURES, dtype=torch.float32, pin_memory=pin
+        )
+        self._host_np = self._host_buf.numpy()
+        self._device_buf = (
+            self._host_buf if self.device.type == "cpu"
+            else torch.empty_like(self._host_buf, device=self.device)
+        )
+        self._capacity = capacity
 
     def choose_action(
         self, state: CatanState, legal_actions: list[tuple], player: int
     ) -> tuple:
-        if len(legal_actions) == 0:
+        return self.choose_actions([state], [legal_actions], [player])[0]
+
+    def choose_actions(
+        self,
+        states: list[CatanState],
+        legal_actions_lists: list[list[tuple]],
+        players: list[int],
+    ) -> list[tuple]:
+        """Greedy actions for several decisions with one batched forward pass.
+
+        Decisions with a single legal action skip the network.
+        """
+        if any(len(legal) == 0 for legal in legal_actions_lists):
             raise ValueError("No legal actions available")
-        if len(legal_actions) == 1:
-            return legal_actions[0]
+        chosen = [legal[0] for legal in legal_actions_lists]
+        pending = [i for i, legal in enumerate(legal_actions_lists) if len(legal) > 1]
+        if not pending:
+            return chosen
+
+        n = len(pending)
+        if n > self._capacity:
+            self._reserve(n)
+        extract_features_batch(
+            [states[i] for i in pending], [players[i] for i in pending],
+            out=self._host_np[:n],
+        )
+        features_tensor = self._device_buf[:n]
+        if self._device_buf is not self._host_buf:
+            features_tensor.copy_(self._host_buf[:n], non_blocking=True)
+        if self.input_dtype != torch.float32:
+            features_tensor = features_tensor.to(self.input_dtype)
+
+        with torch.inference_mode():
+            policy_logits, _ = self.model(features_tensor)
 
-        state_features = extract_features(state, player)
-        features_tensor = torch.tensor(
-            state_features, dtype=torch.float32, device=self.device
-        ).unsqueeze(0)
+            # Legal actions occupy slots [0, num_legal) of each row, so the
+            # greedy choice is the argmax of that prefix; only the n indices
+            # come back from the device.
+            num_legal = torch.tensor(
+                [len(legal_actions_lists[i]) for i in pending], device=self.device
+            )
+            illegal = self._action_slots >= num_legal[:, None]
+            best = policy_logits.masked_fill(illegal, float("-inf")).argmax(-1).tolist()
+        for i, idx in zip(pending, best):
+            chosen[i] = legal_actions_lists[i][idx]
+        return chosen
 
-        with torch.no_grad():
-            policy_logits, _ = self.model(features_tensor)
-            policy_logits = policy_logits.squeeze(0)
 
-        # Mask illegal actions
-        num_legal = len(legal_actions)
-        mask = torch.zeros(self.max_actions, dtype=torch.bool, device=self.device)
-        mask[:num_legal] = True
+# ---- Evaluation ----
 
-        masked_logits = policy_logits.clone()
-        masked_logits[~mask] = float("-inf")
+class _LiveGame:
+    """One in-progress game of a batched evaluation run."""
 
-        # Greedy selection (argmax)
-        action_idx = masked_logits.argmax().item()
-        if action_idx >= num_legal:
-            action_idx = 0
-        return legal_actions[action_idx]
+    def __init__(self) -> None:
+        self.env = CatanEnv(player_count=4, copy_on_step=False)  # states are not kept across steps
+        self.state: CatanState = self.env.state
+        self.legal_actions: list[tuple] = []  # reused every step
+        self.step_count = 0
+        self.done = False
 
+    def restart(self, seed: int | None = None) -> None:
+        self.state = self.env.reset(seed=seed)
+        self.step_count = 0
+        self.done = False
+
+    def step(self, action: tuple) -> None:
+        self.state, _reward, self.done, _info = self.env.step(action)
+        self.step_count += 1
+
+
+# --precision choices: dtype of the evaluated PolicyValueNet's weights
+PRECISIONS = {"fp32": torch.float32, "bf16": torch.bfloat16, "fp16": torch.float16}
+
+
+def _load_model(
+    checkpoint_path: str, device: torch.device, max_actions: int,
+    precision: str = "fp32",
+) -> torch.nn.Module:
+    """Load a PolicyValueNet or CatanMLP checkpoint in eval mode.
+
+    A PolicyValueNet is cast to the *precision* dtype (see PRECISIONS).
+    """
+    checkpoint = torch.load(
+        checkpoint_path, map_location="cpu", weights_only=True
+    )
+    state_dict = checkpoint["model_state_dict"]
+
+    if "shared_fc1.weight" in state_dict:
+        model = PolicyValueNet(input_size=INPUT_SIZE, max_actions=max_actions)
+        model.load_state_dict(state_dict)
+    else:
+        model = CatanMLP(input_size=INPUT_SIZE)
+        model.load_state_dict(state_dict)
+    model.to(device)
+    model.eval()
+    if isinstance(model, PolicyValueNet) and PRECISIONS[precision] != torch.float32:
+        model = model.to_inference(PRECISIONS[precision], device)
+    return model
+
+
+OPPONENT_TYPES = {"random": RandomOpponent, "heuristic": HeuristicOpponent}
+
+
+def _make_neural_agent(
+    model: torch.nn.Module, device: torch.device, max_actions: int
+) -> NeuralOpponent | None:
+    """Build the player-0 neural agent (None if the model is value-only)."""
+    if not isinstance(model, PolicyValueNet):
+        # CatanMLP is value-only; fall back to heuristic with neural ranking
+        return None
+    return NeuralOpponent(
+        compile_for_inference(model), device, max_actions,
+        input_dtype=next(model.parameters()).dtype,
+    )
+
+
+def _play_games(
+    opponent: RandomOpponent | HeuristicOpponent,
+    neural_agent: NeuralOpponent | None,
+    game_seeds: list[int | None],
+    num_parallel: int,
+    verbose: bool = False,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Play one game per entry of game_seeds, num_parallel at a time so that
+    player 0's decisions can be batched into one forward pass per tick.
+
+    Returns:
+        (winners, steps, trained_vps) per game in finishing order; a
+        winner of -1 means the game timed out.
+    """
+    num_games = len(game_seeds)
+    max_steps = 2000
+    games = [_LiveGame() for _ in range(min(max(num_parallel, 1), num_games))]
+    for i, game in enumerate(games):
+        game.restart(game_seeds[i])
+    started = len(games)
+    finished = 0
+
+    winners = np.full(num_games, -1, dtype=np.int8)
+    game_steps = np.empty(num_games, dtype=np.int32)
+    trained_vps = np.empty(num_games, dtype=np.int8)
+
+    while games:
+        neural_games: list[_LiveGame] = []
+        over: list[_LiveGame] = []
+        for game in games:
+            acting_player = game.env.get_acting_player()
+            num_legal = game.env.get_legal_actions_into(game.legal_actions)
+            if num_legal == 0:
+                over.append(game)
+            elif num_legal == 1:
+                # Forced move (rolling, most steals, ...): no agent needed
+                game.step(game.legal_actions[0])
+            # Player 0 = trained model, players 1-3 = opponent
+            elif acting_player == 0 and neural_agent is not None:
+                neural_games.append(game)
+            else:
+                game.step(opponent.choose_action(
+                    game.state, game.legal_actions, acting_player
+                ))
+
+        if neural_games:
+            actions = neural_agent.choose_actions(
+                [g.state for g in neural_games],
+                [g.legal_actions for g in neural_games],
+                [0] * len(neural_games),
+            )
+            for game, action in zip(neural_games, actions):
+                game.step(action)
+
+        over.extend(g for g in games
+                    if g not in over and (g.done or g.step_count >= max_steps))
+        for game in over:
+            state = game.state
+            if state.winner is not None:
+                winners[finished] = state.winner
+            game_steps[finished] = game.step_count
+            trained_vps[finished] = calculate_vp(state, 0)
+            finished += 1
+
+            if verbose and finished % 100 == 0:
+                pct = finished / num_games * 100
+                win_rate = np.count_nonzero(winners[:finished] == 0) / finished
+                print(
+                    f"  Game {finished}/{num_games} ({pct:.0f}%) - "
+                    f"Trained win rate: {win_rate:.2%}"
+                )
+
+            if started < num_games:
+                game.restart(game_seeds[started])
+                started += 1
+            else:
+                games.remove(game)
+
+    return winners, game_steps, trained_vps
+
+
+# Batches below this many rows are tiny GEMVs, where intra-op threads cost
+# more in fork/join than they save
+_MIN_THREADED_BATCH = 32
+
+
+def _torch_threads_for(num_parallel: int, num_workers: int) -> int:
+    """Default intra-op thread count for each evaluating process."""
+    if num_parallel < _MIN_THREADED_BATCH:
+        return 1
+    # Split the cores between worker processes instead of oversubscribing
+    return max(1, (os.cpu_count() or 1) // max(num_workers, 1))
+
+
+def _set_torch_threads(num_threads: int) -> None:
+    torch.set_num_threads(num_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        pass  # only settable before the first inter-op parallel work
+
+
+# Per-process state of an evaluation worker (see _init_worker)
+_WORKER: dict = {}
+
+
+def _init_worker(
+    checkpoint_path: str, opponent_type: str, max_actions: int, num_parallel: int,
+    torch_threads: int, precision: str,
+) -> None:
+    _set_torch_threads(torch_threads)
+    device = torch.device("cpu")
+    model = _load_model(checkpoint_path, device, max_actions, precision)
+    # Compiled once per worker; the agent is reused by every shard it plays
+    _WORKER.update(
+        neural_agent=_make_neural_agent(model, device, max_actions),
+        opponent_type=opponent_type,
+        num_parallel=num_parallel,
+    )
+
+
+def _play_shard(
+    shard: tuple[np.random.SeedSequence, list[int | None]]
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    opponent_seed, game_seeds = shard
+    opponent = OPPONENT_TYPES[_WORKER["opponent_type"]](opponent_seed)
+    return _play_games(
+        opponent, _WORKER["neural_agent"], game_seeds, _WORKER["num_parallel"]
+    )
 
-# ---- Evaluation ----
 
 def evaluate(
     checkpoint_path: str,
@@ -212,6 +470,11 @@ def evaluate(
     device_str: str = "cpu",
     max_actions: int = 200,
     verbose: bool = False,
+    num_parallel: int = 32,
+    seed: int | None = None,
+    num_workers: int = 1,
+    torch_threads: int | None = None,
+    precision: str = "fp32",
 ) -> dict:
     """
     Evaluate a trained model against baseline opponents.
@@ -225,101 +488,92 @@ def evaluate(
         device_str: Device string
         max_actions: Max action space size
         verbose: Print per-game results
+        num_parallel: Games played side by side; player 0's decisions
+            across them share one batched forward pass
+        seed: Seeds boards, dice and opponents for a reproducible run
+            (for fixed num_parallel and num_workers); None for fresh entropy
+        num_workers: CPU worker processes; games are split into shards
+            that each worker plays with its own copy of the model.  Ignored
+            (one process) for non-CPU devices.
+        torch_threads: Intra-op threads per evaluating process; None picks
+            1 for small batches and the process's share of the cores otherwise
+        precision: PRECISIONS key for the PolicyValueNet weights; bf16/fp16
+            pay off on GPUs and CPUs with native half-precision matmuls
 
     Returns:
         Dictionary of evaluation statistics
     """
     device = torch.device(device_str)
-
-    # Load model
+    if num_workers <= 1 or device.type != "cpu":
+        num_workers = 1
+    if torch_threads is None:
+        torch_threads = _torch_threads_for(num_parallel, num_workers)
+    if num_workers == 1:
+        _set_torch_threads(torch_threads)
+
+    # Workers load their own copy of the model (see _init_worker)
     print(f"Loading model from: {checkpoint_path}")
-    checkpoint = torch.load(
-        checkpoint_path, map_location="cpu", weights_only=True
-    )
-    state_dict = checkpoint["model_state_dict"]
-
-    if "shared_fc1.weight" in state_dict:
-        model = PolicyValueNet(input_size=INPUT_SIZE, max_actions=max_actions)
-        model.load_state_dict(state_dict)
-    else:
-        model = CatanMLP(input_size=INPUT_SIZE)
-        model.load_state_dict(state_dict)
-    model.to(device)
-    model.eval()
 
     # Create opponents
-    if opponent_type == "random":
-        opponent = RandomOpponent()
-        print("Opponent: Random")
-    elif opponent_type == "heuristic":
-        opponent = HeuristicOpponent()
-        print("Opponent: Heuristic")
-    else:
+    if opponent_type not in OPPONENT_TYPES:
         print(f"Unknown opponent type: {opponent_type}")
         sys.exit(1)
+    print(f"Opponent: {opponent_type.capitalize()}")
 
-    # Neural agent for player 0
-    if isinstance(model, PolicyValueNet):
-        neural_agent = NeuralOpponent(model, device, max_actions)
+    if seed is None:
+        game_seeds: list[int | None] = [None] * num_games
     else:
-        # CatanMLP is value-only; fall back to heuristic with neural ranking
-        neural_agent = None
-
-    # Run games
-    env = CatanEnv(player_count=4)
-
-    wins_by_player: dict[int, int] = defaultdict(int)
-    total_steps_list: list[int] = []
-    trained_vps: list[int] = []
+        game_seeds = np.random.SeedSequence(seed).generate_state(num_games).tolist()
+    # Opponent seeds stay independent of the per-game env seeds
+    opponent_seeds = np.random.SeedSequence(None if seed is None else [seed, 1])
 
     print(f"\nPlaying {num_games} games...")
     start_time = time.time()
 
-    for game_idx in range(num_games):
-        state = env.reset()
-        step_count = 0
-        max_steps = 2000
-        done = False
-
-        while not done and step_count < max_steps:
-            acting_player = env.get_acting_player()
-            legal_actions = env.get_legal_actions()
-
-            if len(legal_actions) == 0:
-                break
-
-            # Player 0 = trained model, players 1-3 = opponent
-            if acting_player == 0 and neural_agent is not None:
-                action = neural_agent.choose_action(
-                    state, legal_actions, acting_player
-                )
-            else:
-                action = opponent.choose_action(
-                    state, legal_actions, acting_player
-                )
-
-            state, _reward, done, info = env.step(action)
-            step_count += 1
-
-        winner = state.winner
-        if winner is not None:
-            wins_by_player[winner] += 1
-
-        total_steps_list.append(step_count)
-        trained_vps.append(calculate_vp(state, 0))
-
-        if verbose and (game_idx + 1) % 100 == 0:
-            pct = (game_idx + 1) / num_games * 100
-            win_rate = wins_by_player.get(0, 0) / (game_idx + 1)
-            print(
-                f"  Game {game_idx + 1}/{num_games} ({pct:.0f}%) - "
-                f"Trained win rate: {win_rate:.2%}"
-            )
+    if num_workers == 1:
+        model = _load_model(checkpoint_path, device, max_actions, precision)
+        opponent = OPPONENT_TYPES[opponent_type](opponent_seeds)
+        neural_agent = _make_neural_agent(model, device, max_actions)
+        winners, game_steps, trained_vps = _play_games(
+            opponent, neural_agent, game_seeds, num_parallel, verbose
+        )
+    else:
+        # A few shards per worker keeps the pool busy as games finish
+        num_shards = min(num_workers * 4, max(num_games, 1))
+        bounds = np.linspace(0, num_games, num_shards + 1).astype(int).tolist()
+        shards = list(zip(
+            opponent_seeds.spawn(num_shards),
+            [game_seeds[a:b] for a, b in zip(bounds, bounds[1:])],
+        ))
+        parts = []
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(
+            num_workers, initializer=_init_worker,
+            initargs=(
+                checkpoint_path, opponent_type, max_actions, num_parallel, torch_threads,
+                precision,
+            ),
+        ) as pool:
+            for part in pool.imap(_play_shard, shards):
+                parts.append(part)
+                if verbose:
+                    done_games = sum(len(p[0]) for p in parts)
+                    wins = sum(int(np.count_nonzero(p[0] == 0)) for p in parts)
+                    print(
+                        f"  Game {done_games}/{num_games} "
+                        f"({done_games / max(num_games, 1) * 100:.0f}%) - "
+                        f"Trained win rate: {wins / max(done_games, 1):.2%}"
+                    )
+        winners, game_steps, trained_vps = (
+            np.concatenate([p[i] for p in parts]) for i in range(3)
+        )
 
     elapsed = time.time() - start_time
 
     # Compute statistics
-    total_finished = sum(wins_by_player.values())
+    win_counts = np.bincount(winners[winners >= 0], minlength=4)
+    wins_by_player = {pid: int(n) for pid, n in enumerate(win_counts) if n}
+    total_finished = int(win_counts.sum())
     trained_wins = wins_by_player.get(0, 0)
     trained_win_rate = trained_wins / num_games if num_games > 0 else 0
 
@@ -328,10 +582,10 @@ def evaluate(
         "opponent_type": opponent_type,
         "trained_wins": trained_wins,
         "trained_win_rate": trained_win_rate,
-        "wins_by_player": dict(wins_by_player),
+        "wins_by_player": wins_by_player,
         "games_finished": total_finished,
         "games_timed_out": num_games - total_finished,
-        "avg_steps": float(np.mean(total_steps_list)),
+        "avg_steps": float(np.mean(game_steps)),
         "avg_trained_vp": float(np.mean(trained_vps)),
         "median_trained_vp": float(np.median(trained_vps)),
         "elapsed_seconds": elapsed,
@@ -401,6 +655,27 @@ def main() -> None:
         "--max-actions", type=int, default=200,
         help="Max action space size (default: 200)",
     )
+    parser.add_argument(
+        "--parallel", type=int, default=32,
+        help="Games played side by side for batched inference (default: 32)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="CPU worker processes for evaluation (default: 1)",
+    )
+    parser.add_argument(
+        "--torch-threads", type=int, default=None,
+        help="Intra-op torch threads per process (default: 1 for batches "
+             "under 32, else the process's share of the cores)",
+    )
+    parser.add_argument(
+        "--precision", choices=list(PRECISIONS), default="fp32",
+        help="Weight precision for inference (default: fp32)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None,
+        help="Random seed for a reproducible evaluation (default: none)",
+    )
     parser.add_argument(
         "--verbose", action="store_true",
         help="Print progress every 100 games",
@@ -419,6 +694,11 @@ def main() -> None:
         device_str=args.device,
         max_actions=args.max_actions,
         verbose=args.verbose,
+        num_parallel=args.parallel,
+        seed=args.seed,
+        num_workers=args.workers,
+        torch_threads=args.torch_threads,
+        precision=args.precision,
     )
 
     print_results(results)
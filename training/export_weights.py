@@ -14,8 +14,13 @@ weights[i] is the i-th row of the weight matrix (output dimension),
 so weights[j][k] = W[j,k] where j is output index and k is input index.
 This matches PyTorch's nn.Linear convention (weight shape: [out_features, in_features]).
 
+With --quant int8 each layer is instead stored as
+    { "quant": "per_row_int8", "weights_q8": [[...], ...], "scales": [...], "biases": [...] }
+where W[j,k] ~= weights_q8[j][k] * scales[j].  Biases stay full precision.
+
 Usage:
     python export_weights.py --checkpoint checkpoints/latest.pt --output ../public/ai-models/default-model.json
+    python export_weights.py --checkpoint checkpoints/latest.pt --output model-q8.json --quant int8
 """
 
 from __future__ import annotations
@@ -25,47 +30,103 @@ import json
 import os
 import sys
 
+import numpy as np
 import torch
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
 from model import PolicyValueNet, CatanMLP, INPUT_SIZE
 
 
-def export_from_policy_value_net(checkpoint_path: str, output_path: str) -> None:
-    """
-    Export value network weights from a PolicyValueNet checkpoint.
+# Value-network layers per architecture, as (weight key, bias key)
+LAYER_MAPPINGS: dict[str, list[tuple[str, str]]] = {
+    # PolicyValueNet -- extract value network layers
+    "policy_value": [
+        ("shared_fc1.weight", "shared_fc1.bias"),
+        ("shared_fc2.weight", "shared_fc2.bias"),
+        ("value_head.weight", "value_head.bias"),
+    ],
+    # CatanMLP -- direct mapping
+    "mlp": [
+        ("fc1.weight", "fc1.bias"),
+        ("fc2.weight", "fc2.bias"),
+        ("fc3.weight", "fc3.bias"),
+    ],
+}
 
-    The value network consists of 3 linear layers:
-        shared_fc1 (227 -> 256)
-        shared_fc2 (256 -> 128)
-        value_head (128 -> 1)
 
-    These map directly to the TypeScript MLP layers.
+def load_checkpoint(checkpoint_path: str) -> tuple[dict, str, dict]:
+    """
+    Load a checkpoint once and detect its architecture.
+
+    Returns:
+        (state_dict, arch, config) where arch is a LAYER_MAPPINGS key.
     """
     print(f"Loading checkpoint: {checkpoint_path}")
     checkpoint = torch.load(checkpoint_path, map_location="cpu", weights_only=True)
-
-    # Load the model
     state_dict = checkpoint["model_state_dict"]
 
     # Check if this is a PolicyValueNet or CatanMLP
     if "shared_fc1.weight" in state_dict:
-        # PolicyValueNet -- extract value network layers
-        layer_mappings = [
-            ("shared_fc1.weight", "shared_fc1.bias"),
-            ("shared_fc2.weight", "shared_fc2.bias"),
-            ("value_head.weight", "value_head.bias"),
-        ]
+        arch = "policy_value"
     elif "fc1.weight" in state_dict:
-        # CatanMLP -- direct mapping
-        layer_mappings = [
-            ("fc1.weight", "fc1.bias"),
-            ("fc2.weight", "fc2.bias"),
-            ("fc3.weight", "fc3.bias"),
-        ]
+        arch = "mlp"
     else:
         print("Error: Unrecognized model architecture in checkpoint.")
         print(f"Available keys: {list(state_dict.keys())}")
         sys.exit(1)
+    return state_dict, arch, checkpoint.get("config", {})
+
+
+def build_model(arch: str, state_dict: dict, config: dict) -> torch.nn.Module:
+    """Instantiate the PyTorch model for *arch* from an already-loaded state dict."""
+    if arch == "policy_value":
+        max_actions = config.get("max_actions", 200)
+        model: torch.nn.Module = PolicyValueNet(input_size=INPUT_SIZE, max_actions=max_actions)
+    else:
+        model = CatanMLP(input_size=INPUT_SIZE)
+    model.load_state_dict(state_dict)
+    model.eval()
+    return model
+
+
+QUANT_MODES = ("fp32", "int8")
+
+# |PyTorch - JSON| allowed by verify_export, per export mode
+VERIFY_TOLERANCE = {"fp32": 1e-5, "int8": 1e-2}
+
+
+def quantize_rows(weight: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Symmetric per-output-row int8 quantization.
+
+    Returns (q, scales) with weight[j] ~= q[j] * scales[j].  All-zero rows
+    get a scale of 0.
+    """
+    scales = np.abs(weight).max(axis=1) / 127.0
+    safe = np.where(scales > 0, scales, 1.0)
+    q = np.clip(np.rint(weight / safe[:, None]), -127, 127).astype(np.int8)
+    return q, scales
+
+
+def export_from_policy_value_net(
+    state_dict: dict, arch: str, output_path: str, quant: str = "fp32"
+) -> None:
+    """
+    Export value network weights from a loaded checkpoint (see load_checkpoint).
+
+    For a PolicyValueNet the value network consists of 3 linear layers:
+        shared_fc1 (227 -> 256)
+        shared_fc2 (256 -> 128)
+        value_head (128 -> 1)
+
+    These map directly to the TypeScript MLP layers.  ``quant`` is one of
+    QUANT_MODES; "int8" stores per-row quantized weights (see quantize_rows).
+    """
+    layer_mappings = LAYER_MAPPINGS[arch]
 
     # Build the JSON structure
     layers = []
@@ -76,10 +137,14 @@ def export_from_policy_value_net(checkpoint_path: str, output_path: str) -> None
         # Convert to nested lists (row-major: weights[j][k] where j=output, k=input)
         # This matches the TypeScript convention: layer.weights[j] is the weight vector
         # for output neuron j, and layer.weights[j][k] is the connection from input k.
-        layer = {
-            "weights": weight.tolist(),
-            "biases": bias.tolist(),
-        }
+        # float64 so the written decimals are those of the old tolist() path.
+        w = weight.detach().cpu().numpy().astype(np.float64)
+        b = bias.detach().cpu().numpy().astype(np.float64)
+        if quant == "int8":
+            q, scales = quantize_rows(w)
+            layer = {"quant": "per_row_int8", "weights_q8": q, "scales": scales, "biases": b}
+        else:
+            layer = {"weights": w, "biases": b}
         layers.append(layer)
 
         print(f"  Layer: {weight_key} -> shape {list(weight.shape)}")
@@ -88,85 +153,82 @@ def export_from_policy_value_net(checkpoint_path: str, output_path: str) -> None
 
     # Write JSON
     os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
-    with open(output_path, "w") as f:
-        json.dump(model_weights, f)
+    if orjson is not None:
+        # orjson walks the arrays directly, without building nested lists
+        with open(output_path, "wb") as f:
+            f.write(orjson.dumps(model_weights, option=orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        # json.dumps (unlike json.dump) uses the C encoder; it needs plain lists
+        for layer in layers:
+            for key, value in layer.items():
+                if isinstance(value, np.ndarray):
+                    layer[key] = value.tolist()
+        with open(output_path, "w") as f:
+            f.write(json.dumps(model_weights))
 
     # Report file size
     file_size = os.path.getsize(output_path)
     print(f"\nExported to: {output_path}")
     print(f"File size: {file_size / 1024:.1f} KB")
-    print(f"Layers: {len(layers)}")
+    print(f"Layers: {len(layers)} ({quant})")
     for i, layer in enumerate(layers):
-        w = layer["weights"]
+        w = layer["weights_q8" if quant == "int8" else "weights"]
         print(f"  Layer {i}: weights [{len(w)}][{len(w[0])}], biases [{len(layer['biases'])}]")
 
 
-def verify_export(checkpoint_path: str, output_path: str) -> None:
+def verify_export(state_dict: dict, arch: str, config: dict, output_path: str) -> None:
     """
     Verify that the exported JSON weights produce the same output as the PyTorch model.
-    """
-    import numpy as np
 
+    Quantized layers are dequantized first and checked against the looser
+    int8 tolerance.
+    """
     print("\n--- Verification ---")
 
-    # Load PyTorch model
-    checkpoint = torch.load(checkpoint_path, map_location="cpu", weights_only=True)
-    state_dict = checkpoint["model_state_dict"]
+    model = build_model(arch, state_dict, config)
 
-    if "shared_fc1.weight" in state_dict:
-        config = checkpoint.get("config", {})
-        max_actions = config.get("max_actions", 200)
-        model = PolicyValueNet(input_size=INPUT_SIZE, max_actions=max_actions)
-        model.load_state_dict(state_dict)
-        model.eval()
-
-        # Generate random input
-        x = torch.randn(1, INPUT_SIZE)
-        with torch.no_grad():
+    # Generate random input
+    x = torch.randn(1, INPUT_SIZE)
+    with torch.no_grad():
+        if arch == "policy_value":
             _, value = model(x)
-        pytorch_value = value.item()
-    else:
-        model = CatanMLP(input_size=INPUT_SIZE)
-        model.load_state_dict(state_dict)
-        model.eval()
-
-        x = torch.randn(1, INPUT_SIZE)
-        with torch.no_grad():
+        else:
             value = model(x)
-        pytorch_value = value.item()
+    pytorch_value = value.item()
 
     # Load JSON weights and do manual forward pass
     with open(output_path, "r") as f:
         weights_json = json.load(f)
 
-    # Manual forward pass matching TypeScript MLP.forward()
-    current = x.squeeze(0).numpy().tolist()
+    # Manual forward pass matching TypeScript MLP.forward().  float64, like
+    # the JS numbers the TypeScript side computes with.
+    layers = weights_json["layers"]
+    current = x.squeeze(0).numpy().astype(np.float64)
 
-    for i, layer in enumerate(weights_json["layers"]):
-        w = layer["weights"]
-        b = layer["biases"]
-        output = []
-        for j in range(len(b)):
-            s = b[j]
-            for k in range(len(current)):
-                s += w[j][k] * current[k]
-            output.append(s)
+    quant = "fp32"
+    for i, layer in enumerate(layers):
+        if layer.get("quant") == "per_row_int8":
+            quant = "int8"
+            scales = np.asarray(layer["scales"], dtype=np.float64)
+            w = np.asarray(layer["weights_q8"], dtype=np.float64) * scales[:, None]
+        else:
+            w = np.asarray(layer["weights"], dtype=np.float64)
+        b = np.asarray(layer["biases"], dtype=np.float64)
+        current = w @ current + b
 
-        is_last = i == len(weights_json["layers"]) - 1
+        is_last = i == len(layers) - 1
         if is_last:
-            output = [np.tanh(v) for v in output]
+            current = np.tanh(current)
         else:
-            output = [max(0, v) for v in output]
+            current = np.maximum(current, 0.0)
 
-        current = output
-
-    json_value = current[0]
+    json_value = float(current[0])
 
     print(f"PyTorch value:  {pytorch_value:.8f}")
     print(f"JSON value:     {json_value:.8f}")
     print(f"Difference:     {abs(pytorch_value - json_value):.2e}")
 
-    if abs(pytorch_value - json_value) < 1e-5:
+    if abs(pytorch_value - json_value) < VERIFY_TOLERANCE[quant]:
         print("PASS: Values match within tolerance.")
     else:
         print("WARNING: Values differ more than expected. Check weight export.")
@@ -194,6 +256,12 @@ def main() -> None:
         default=False,
         help="Verify exported weights produce same output as PyTorch model",
     )
+    parser.add_argument(
+        "--quant",
+        choices=QUANT_MODES,
+        default="fp32",
+        help="Weight precision: fp32 (default) or per-row int8 with float scales",
+    )
 
     args = parser.parse_args()
 
@@ -201,10 +269,11 @@ def main() -> None:
         print(f"Error: Checkpoint file not found: {args.checkpoint}")
         sys.exit(1)
 
-    export_from_policy_value_net(args.checkpoint, args.output)
+    state_dict, arch, config = load_checkpoint(args.checkpoint)
+    export_from_policy_value_net(state_dict, arch, args.output, args.quant)
 
     if args.verify:
-        verify_export(args.checkpoint, args.output)
+        verify_export(state_dict, arch, config, args.output)
 
 
 if __name__ == "__main__":
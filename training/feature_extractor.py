@@ -40,12 +40,17 @@ import numpy as np
 from typing import Optional
 
 from catan_env import (
+    BUILDING_CITY,
+    BUILDING_SETTLEMENT,
     CatanState,
-    calculate_longest_road,
-    calculate_vp,
+    calculate_all_vps,
     RESOURCES,
-    TERRAIN_TO_RESOURCE,
+    DESERT_ID,
+    DEV_CARD_IDX,
+    HARBOR_NONE,
+    NO_OWNER,
 )
+from numba_compat import HAS_NUMBA, njit
 
 # ---- Schema constants (must match feature-schema.ts) ----
 
@@ -73,6 +78,7 @@ PHASE_LIST = [
 ]
 
 RESOURCE_PORTS = ["lumber", "brick", "wool", "grain", "ore"]
+assert RESOURCE_PORTS == ALL_RESOURCES  # vertex_harbor codes follow RESOURCES
 
 # Pip counts for dice roll probabilities (matches board-analysis.ts PIP_COUNTS)
 PIP_COUNTS = {
@@ -80,45 +86,57 @@ PIP_COUNTS = {
     8: 5, 9: 4, 10: 3, 11: 2, 12: 1,
 }
 
-DEV_CARD_TYPES = ["knight", "road_building", "year_of_plenty", "monopoly", "victory_point"]
-
-
-def clamp(v: float) -> float:
-    """Clamp value to [0, 1]."""
-    return max(0.0, min(1.0, v))
-
+# PIP_COUNTS as a lookup table indexed by number token (0 = no token)
+_PIP_LUT = np.zeros(13, dtype=np.float64)
+for _token, _pips in PIP_COUNTS.items():
+    _PIP_LUT[_token] = _pips
 
-def get_pip_count(number_token: Optional[int]) -> int:
-    """Get pip count for a number token (0 for None/7/desert)."""
-    if number_token is None:
-        return 0
-    return PIP_COUNTS.get(number_token, 0)
+DEV_CARD_TYPES = ["knight", "road_building", "year_of_plenty", "monopoly", "victory_point"]
+# Player dev-card count arrays are indexed in this same order
+assert [DEV_CARD_IDX[t] for t in DEV_CARD_TYPES] == list(range(len(DEV_CARD_TYPES)))
+# Normalizers of the dev-cards-by-type features, in DEV_CARD_TYPES order
+DEV_CARD_NORMALIZERS = np.array([14.0, 2.0, 2.0, 2.0, 5.0])
 
 
-def extract_features(state: CatanState, for_player: int) -> np.ndarray:
+def extract_features(
+    state: CatanState, for_player: int, out: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
     Extract feature vector from a CatanState.
 
     Args:
         state: CatanState dataclass from catan_env.py
         for_player: The player whose perspective we extract from (0-3)
+        out: optional float32[TOTAL_FEATURES] buffer to fill instead of
+            allocating (e.g. a row of a preallocated batch)
 
     Returns:
         numpy array of shape (TOTAL_FEATURES,) with values in [0, 1]
     """
-    features = np.zeros(TOTAL_FEATURES, dtype=np.float32)
+    if HAS_NUMBA:
+        # Same values via the batch kernel, without the scalar writes below
+        if out is None:
+            return extract_features_batch([state], [for_player])[0]
+        extract_features_batch([state], [for_player], out=out[np.newaxis])
+        return out
+
+    if out is None:
+        features = np.zeros(TOTAL_FEATURES, dtype=np.float32)
+    else:
+        features = out
+        features.fill(0.0)
     offset = 0
 
     # Player-relative ordering: for_player first, then others in order
     player_order = _get_player_order(state, for_player)
 
     # Per-player features
+    vps = calculate_all_vps(state)
     for pid in player_order:
-        offset = _write_player_features(features, offset, state, pid)
+        offset = _write_player_features(features, offset, state, pid, int(vps[pid]))
 
     # Pad if fewer than 4 players
-    for _ in range(len(player_order), NUM_PLAYERS):
-        offset += PER_PLAYER_SIZE
+    offset += PER_PLAYER_SIZE * (NUM_PLAYERS - len(player_order))
 
     # Global features
     offset = _write_global_features(features, offset, state)
@@ -126,49 +144,218 @@ def extract_features(state: CatanState, for_player: int) -> np.ndarray:
     # Board summary
     offset = _write_board_summary(features, offset, state, for_player)
 
+    # The writers store raw ratios; clamp them all to [0, 1] in one pass
+    np.clip(features, 0.0, 1.0, out=features)
     return features
 
 
-def _get_player_order(state: CatanState, for_player: int) -> list[int]:
+# Raw per-player columns gathered by extract_features_batch: resources (5),
+# dev cards by type (5), knights played, remaining settlements, cities and
+# roads, VP, has longest road, has largest army, road length, total resources
+_BATCH_PLAYER_RAW = 19
+_BATCH_PLAYER_SCALE = np.array(
+    [19.0] * 5 + DEV_CARD_NORMALIZERS.tolist() + [14.0, 5.0, 4.0, 15.0, 10.0, 1.0, 1.0, 15.0, 30.0]
+)
+# Position of each raw column within the 33-feature player block
+_BATCH_PLAYER_DEST = np.array(
+    [0, 1, 2, 3, 4] + list(range(6, 18)) + [32, 5], dtype=np.int64
+)
+_PHASE_INDEX = {phase: i for i, phase in enumerate(PHASE_LIST)}
+
+
+def extract_features_batch(
+    states: list[CatanState], for_players: list[int], out: Optional[np.ndarray] = None
+) -> np.ndarray:
+    """
+    Extract feature vectors for several states at once.
+
+    Row i equals extract_features(states[i], for_players[i]).  The scalar
+    fields are gathered per state and every normalization runs once over the
+    whole batch (in a Numba kernel when available).  All states must share
+    one board topology.
+
+    Args:
+        states: CatanState dataclasses from catan_env.py
+        for_players: perspective player of each state
+        out: optional float32[len(states), TOTAL_FEATURES] buffer to fill;
+            must be C-contiguous (rows back to back), like the default one
+
+    Returns:
+        numpy array of shape (len(states), TOTAL_FEATURES), row-major, so
+        torch.from_numpy wraps it without a copy
+    """
+    n = len(states)
+    if out is None:
+        out = np.zeros((n, TOTAL_FEATURES), dtype=np.float32)
+    else:
+        if not out.flags.c_contiguous:
+            raise ValueError("out must be a C-contiguous (rows, TOTAL_FEATURES) array")
+        out[:] = 0.0
+    if n == 0:
+        return out
+
+    # Player-relative raw columns (see _BATCH_PLAYER_SCALE) and board blocks
+    raw = np.zeros((n, NUM_PLAYERS, _BATCH_PLAYER_RAW), dtype=np.float64)
+    board = np.zeros((n, NUM_PLAYERS, PLAYER_BOARD_SIZE), dtype=np.float32)
+    production = np.zeros((n, NUM_PLAYERS, 5), dtype=np.float32)
+    glob = np.zeros((n, 9), dtype=np.float64)
+    phase = np.full(n, -1, dtype=np.int64)
+    current = np.empty(n, dtype=np.int64)
+    types = np.empty((n, len(states[0].vertex_building_type)), dtype=np.int8)
+    for k, (state, for_player) in enumerate(zip(states, for_players)):
+        order = _get_player_order(state, for_player)
+        vps = calculate_all_vps(state)
+        for slot, pid in enumerate(order):
+            p = state.players[pid]
+            row = raw[k, slot]
+            row[0:5] = p.resources
+            row[5:10] = p.dev_cards
+            row[5:10] += p.new_dev_cards
+            row[10] = p.knights_played
+            row[11] = p.remaining_settlements
+            row[12] = p.remaining_cities
+            row[13] = p.remaining_roads
+            row[14] = vps[pid]
+            row[15] = state.longest_road_player == pid
+            row[16] = state.largest_army_player == pid
+            row[17] = state.road_lengths[pid]
+        player_board = _player_board_features(state)
+        board[k, :len(order)] = player_board[list(order)]
+        production[k, :state.player_count] = player_board[:, _PRODUCTION_SLICE]
+
+        glob[k, 0] = state.turn_number
+        glob[k, 1:6] = state.bank
+        glob[k, 6] = state.dev_card_deck_top
+        glob[k, 7] = _PIP_LUT[state.hex_numbers[state.robber_hex]]
+        glob[k, 8] = state.hex_terrains[state.robber_hex] == DESERT_ID
+        phase[k] = _PHASE_INDEX.get(state.phase, -1)
+        current[k] = state.current_player
+        types[k] = state.vertex_building_type
+
+    topo = states[0].topology
+    assert topo is not None
+    hex_vertices = topo.hex_vertices_arr[:min(len(states[0].hex_terrains), 19)]
+    write = _write_batch_numba if HAS_NUMBA else _write_batch_numpy
+    write(
+        out, raw, board, production, glob, phase, current, types, hex_vertices,
+        _BATCH_PLAYER_SCALE, _BATCH_PLAYER_DEST,
+    )
+    return out
+
+
+def _write_batch_numpy(
+    out, raw, board, production, glob, phase, current, types, hex_vertices,
+    scale, dest,
+) -> None:
+    """Normalize gathered batch columns into *out* (see extract_features_batch)."""
+    n = len(out)
+    raw[:, :, 18] = raw[:, :, 0:5].sum(axis=2)
+    scaled = raw / scale
+    np.clip(scaled, 0.0, 1.0, out=scaled)
+    players = out[:, :PER_PLAYER_SIZE * NUM_PLAYERS].reshape(n, NUM_PLAYERS, PER_PLAYER_SIZE)
+    players[:, :, dest] = scaled
+    players[:, :, 18:18 + PLAYER_BOARD_SIZE] = board
+
+    # Global features
+    offset = PER_PLAYER_SIZE * NUM_PLAYERS
+    rows = np.arange(n)
+    out[:, offset] = np.clip(glob[:, 0] / 200, 0.0, 1.0)
+    known = phase >= 0
+    out[rows[known], offset + 1 + phase[known]] = 1.0
+    out[:, offset + 13:offset + 18] = np.clip(glob[:, 1:6] / 19, 0.0, 1.0)
+    out[:, offset + 18] = np.clip(glob[:, 6] / 25, 0.0, 1.0)
+    out[:, offset + 19] = np.clip(glob[:, 7] / 5, 0.0, 1.0)
+    out[:, offset + 20] = glob[:, 8]
+    seated = (current >= 0) & (current < 4)
+    out[rows[seated], offset + 21 + current[seated]] = 1.0
+
+    # Board summary: production by absolute player, then hex building density
+    offset += GLOBAL_SIZE
+    out[:, offset:offset + 20] = production.reshape(n, 20)
+    totals = types[:, hex_vertices].sum(axis=2)
+    out[:, offset + 20:offset + 20 + len(hex_vertices)] = np.minimum(totals / 6, 1.0)
+
+
+@njit(cache=True)
+def _write_batch_numba(
+    out, raw, board, production, glob, phase, current, types, hex_vertices,
+    scale, dest,
+):
+    """Loop form of _write_batch_numpy."""
+    n = out.shape[0]
+    players = raw.shape[1]
+    for k in range(n):
+        for slot in range(players):
+            base = slot * PER_PLAYER_SIZE
+            total = 0.0
+            for c in range(5):
+                total += raw[k, slot, c]
+            raw[k, slot, 18] = total
+            for c in range(raw.shape[2]):
+                out[k, base + dest[c]] = max(0.0, min(1.0, raw[k, slot, c] / scale[c]))
+            for j in range(board.shape[2]):
+                out[k, base + 18 + j] = board[k, slot, j]
+
+        offset = PER_PLAYER_SIZE * NUM_PLAYERS
+        out[k, offset] = max(0.0, min(1.0, glob[k, 0] / 200))
+        if phase[k] >= 0:
+            out[k, offset + 1 + phase[k]] = 1.0
+        for i in range(5):
+            out[k, offset + 13 + i] = max(0.0, min(1.0, glob[k, 1 + i] / 19))
+        out[k, offset + 18] = max(0.0, min(1.0, glob[k, 6] / 25))
+        out[k, offset + 19] = max(0.0, min(1.0, glob[k, 7] / 5))
+        out[k, offset + 20] = glob[k, 8]
+        if 0 <= current[k] < 4:
+            out[k, offset + 21 + current[k]] = 1.0
+
+        offset += GLOBAL_SIZE
+        for slot in range(players):
+            for i in range(5):
+                out[k, offset + slot * 5 + i] = production[k, slot, i]
+        for h in range(hex_vertices.shape[0]):
+            t = 0
+            for j in range(hex_vertices.shape[1]):
+                t += types[k, hex_vertices[h, j]]
+            out[k, offset + 20 + h] = min(t / 6, 1.0)
+
+
+# _PLAYER_ORDERS[player_count][for_player]: for_player first, then the others
+# in seating order
+_PLAYER_ORDERS = {
+    count: tuple(tuple((first + i) % count for i in range(count)) for first in range(count))
+    for count in range(1, NUM_PLAYERS + 1)
+}
+
+
+def _get_player_order(state: CatanState, for_player: int) -> tuple[int, ...]:
     """Get player-relative ordering: for_player first, then others in order."""
-    order = [for_player]
-    for i in range(1, state.player_count):
-        order.append((for_player + i) % state.player_count)
-    return order
+    return _PLAYER_ORDERS[state.player_count][for_player]
 
 
 def _write_player_features(
-    features: np.ndarray, offset: int, state: CatanState, pid: int
+    features: np.ndarray, offset: int, state: CatanState, pid: int, vp: int
 ) -> int:
     """Write per-player features starting at offset. Returns new offset."""
     p = state.players[pid]
     start_offset = offset
 
     # Resources (normalized: divide by 19, max bank per type)
-    for r in ALL_RESOURCES:
-        features[offset] = clamp(p.resources[r] / 19)
-        offset += 1
+    # (p.resources is an int8 array in ALL_RESOURCES order)
+    features[offset:offset + 5] = p.resources / 19
+    offset += 5
 
     # Total resources (normalized by ~30)
-    total = sum(p.resources[r] for r in ALL_RESOURCES)
-    features[offset] = clamp(total / 30)
+    total = int(p.resources.sum())
+    features[offset] = total / 30
     offset += 1
 
-    # Dev cards by type (both playable and new)
-    dev_counts = _count_dev_cards(p.dev_cards, p.new_dev_cards)
-    features[offset] = clamp(dev_counts["knight"] / 14)
-    offset += 1
-    features[offset] = clamp(dev_counts["road_building"] / 2)
-    offset += 1
-    features[offset] = clamp(dev_counts["year_of_plenty"] / 2)
-    offset += 1
-    features[offset] = clamp(dev_counts["monopoly"] / 2)
-    offset += 1
-    features[offset] = clamp(dev_counts["victory_point"] / 5)
-    offset += 1
+    # Dev cards by type (both playable and new), from the int8 count arrays
+    dev_counts = p.dev_cards + p.new_dev_cards
+    features[offset:offset + 5] = dev_counts / DEV_CARD_NORMALIZERS
+    offset += 5
 
     # Knights played (normalized by 14)
-    features[offset] = clamp(p.knights_played / 14)
+    features[offset] = p.knights_played / 14
     offset += 1
 
     # Remaining pieces
@@ -180,8 +367,7 @@ def _write_player_features(
     offset += 1
 
     # VP (normalized by 10)
-    vp = calculate_vp(state, pid)
-    features[offset] = clamp(vp / 10)
+    features[offset] = vp / 10
     offset += 1
 
     # Has longest road / largest army
@@ -190,46 +376,17 @@ def _write_player_features(
     features[offset] = 1.0 if state.largest_army_player == pid else 0.0
     offset += 1
 
-    # Buildings on board
-    # In CatanState, vertex_buildings[vid] is (type_str, owner_int) or None
-    topo = state.topology
-    assert topo is not None
-    settlements = 0
-    cities = 0
-    for vid in range(topo.vertex_count):
-        b = state.vertex_buildings[vid]
-        if b is not None and b[1] == pid:
-            if b[0] == "settlement":
-                settlements += 1
-            else:
-                cities += 1
-    features[offset] = settlements / 5
-    offset += 1
-    features[offset] = cities / 4
-    offset += 1
-
-    # Port access
-    ports = _player_port_access(state, pid)
-    features[offset] = 1.0 if "generic" in ports else 0.0
-    offset += 1
-    for r in RESOURCE_PORTS:
-        features[offset] = 1.0 if r in ports else 0.0
-        offset += 1
-
-    # Production per resource (normalized: max ~15 pips)
-    prod = _player_resource_production(state, pid)
-    for r in ALL_RESOURCES:
-        features[offset] = clamp(prod[r] / 15)
-        offset += 1
-
-    # Resource diversity (0-5 normalized)
-    diversity_count = sum(1 for r in ALL_RESOURCES if prod[r] > 0)
-    features[offset] = diversity_count / 5
-    offset += 1
-
-    # Road length
-    road_length = calculate_longest_road(state, pid)
-    features[offset] = clamp(road_length / 15)
+    # Buildings on board, port access, production per resource and resource
+    # diversity: depend only on buildings and the robber, see
+    # _player_board_features
+    board = _player_board_features(state)[pid]
+    features[offset:offset + PLAYER_BOARD_SIZE] = board
+    offset += PLAYER_BOARD_SIZE
+
+    # Road length (kept current by the env as roads and settlements are
+    # placed; equals calculate_longest_road(state, pid))
+    road_length = state.road_lengths[pid]
+    features[offset] = road_length / 15
     offset += 1
 
     # Verify we wrote the right number of features
@@ -243,35 +400,35 @@ def _write_player_features(
 def _write_global_features(features: np.ndarray, offset: int, state: CatanState) -> int:
     """Write global features starting at offset. Returns new offset."""
     # Turn number (normalized by ~200)
-    features[offset] = clamp(state.turn_number / 200)
+    features[offset] = state.turn_number / 200
     offset += 1
 
     # Phase one-hot
-    for phase in PHASE_LIST:
-        features[offset] = 1.0 if state.phase == phase else 0.0
-        offset += 1
+    phase = _PHASE_INDEX.get(state.phase)
+    if phase is not None:
+        features[offset + phase] = 1.0
+    offset += len(PHASE_LIST)
 
     # Bank resources
-    for r in ALL_RESOURCES:
-        features[offset] = clamp(state.bank[r] / 19)
-        offset += 1
+    features[offset:offset + 5] = state.bank / 19
+    offset += 5
 
     # Dev cards remaining
-    features[offset] = clamp(len(state.dev_card_deck) / 25)
+    features[offset] = state.dev_card_deck_top / 25
     offset += 1
 
     # Robber hex info
     robber_number = state.hex_numbers[state.robber_hex]
     robber_terrain = state.hex_terrains[state.robber_hex]
-    features[offset] = clamp(get_pip_count(robber_number) / 5)
+    features[offset] = _PIP_LUT[robber_number] / 5
     offset += 1
-    features[offset] = 1.0 if robber_terrain == "desert" else 0.0
+    features[offset] = 1.0 if robber_terrain == DESERT_ID else 0.0
     offset += 1
 
     # Current player one-hot
-    for i in range(4):
-        features[offset] = 1.0 if state.current_player == i else 0.0
-        offset += 1
+    if 0 <= state.current_player < 4:
+        features[offset + state.current_player] = 1.0
+    offset += 4
 
     return offset
 
@@ -280,39 +437,28 @@ def _write_board_summary(
     features: np.ndarray, offset: int, state: CatanState, for_player: int
 ) -> int:
     """Write board summary features starting at offset. Returns new offset."""
-    topo = state.topology
-    assert topo is not None
-
     # Per-resource production concentration per player (5 * 4 = 20)
+    board = _player_board_features(state)
     for i in range(state.player_count):
-        prod = _player_resource_production(state, i)
-        for r in ALL_RESOURCES:
-            features[offset] = clamp(prod[r] / 15)
-            offset += 1
+        features[offset:offset + 5] = board[i, _PRODUCTION_SLICE]
+        offset += 5
 
     # Pad for missing players
-    for i in range(state.player_count, 4):
-        offset += 5
+    offset += 5 * (NUM_PLAYERS - state.player_count)
 
     # Vertex ownership summary: for each hex, total building density
     # Matches the TS writeBoardSummary logic
     hex_count = min(len(state.hex_terrains), 19)
     base_offset = PER_PLAYER_SIZE * NUM_PLAYERS + GLOBAL_SIZE + 20
 
-    for hid in range(hex_count):
-        if (offset - base_offset) >= BOARD_SUMMARY_SIZE - 20:
-            break
-        # For each hex, count buildings (normalized)
-        total_buildings = 0
-        for vid in topo.hex_vertices[hid]:
-            b = state.vertex_buildings[vid]
-            if b is not None:
-                mult = 2 if b[0] == "city" else 1
-                total_buildings += mult
-        features[offset] = clamp(total_buildings / 6)
-        offset += 1
-        if offset >= TOTAL_FEATURES:
-            break
+    # For each hex, count buildings (normalized); city counts double,
+    # which is exactly the building type code
+    n = min(hex_count, BOARD_SUMMARY_SIZE - 20 - (offset - base_offset), TOTAL_FEATURES - offset)
+    if n > 0:
+        incidence = state.topology.hex_vertex_matrix[:n]
+        totals = incidence @ state.vertex_building_type.astype(np.float32)
+        features[offset:offset + n] = np.minimum(totals / 6, 1.0)
+        offset += n
 
     # Fill remaining with zeros (already initialized), snap offset
     offset = PER_PLAYER_SIZE * NUM_PLAYERS + GLOBAL_SIZE + BOARD_SUMMARY_SIZE
@@ -320,67 +466,70 @@ def _write_board_summary(
     return offset
 
 
-def _count_dev_cards(dev_cards: list[str], new_dev_cards: list[str]) -> dict[str, int]:
-    """Count development cards by type (both playable and new)."""
-    counts = {t: 0 for t in DEV_CARD_TYPES}
-    for c in dev_cards:
-        if c in counts:
-            counts[c] += 1
-    for c in new_dev_cards:
-        if c in counts:
-            counts[c] += 1
-    return counts
+# Per-player features that depend only on buildings and the robber:
+# settlements, cities, port access (6), production per resource (5), diversity
+PLAYER_BOARD_SIZE = 2 + 6 + 5 + 1
+_PRODUCTION_SLICE = slice(8, 13)
 
 
-def _player_port_access(state: CatanState, player: int) -> set[str]:
-    """
-    Get harbor types accessible to a player.
-    Matches evaluation/board-analysis.ts playerPortAccess.
+def _player_board_features(state: CatanState) -> np.ndarray:
+    """float32[player_count, PLAYER_BOARD_SIZE] building-derived player features.
 
-    In CatanState, harbors are Harbor dataclass instances with .type and .vertices (tuple).
-    vertex_buildings[vid] is (type_str, owner_int) or None.
+    Cached on the state keyed on (building version, robber hex), so the
+    board walk only reruns after a build or a robber move.  The cached array
+    is never written to, so state copies can share it.
     """
-    ports: set[str] = set()
-    for harbor in state.harbors:
-        for vid in harbor.vertices:
-            b = state.vertex_buildings[vid]
-            if b is not None and b[1] == player:
-                ports.add(harbor.type)
-    return ports
+    key = (state._build_version, state.robber_hex)
+    cached = state._feature_cache
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    block = np.zeros((state.player_count, PLAYER_BOARD_SIZE), dtype=np.float32)
+    owned = state.vertex_building_owner == np.arange(state.player_count)[:, None]
+    types = state.vertex_building_type
+    block[:, 0] = (owned & (types == BUILDING_SETTLEMENT)).sum(axis=1) / 5
+    block[:, 1] = (owned & (types == BUILDING_CITY)).sum(axis=1) / 4
+
+    # Port access (board-analysis.ts playerPortAccess): vertex_harbor codes
+    # are HARBOR_GENERIC = 0 or 1 + resource index, i.e. the slot after row[2]
+    owners = state.vertex_building_owner
+    on_port = (owners != NO_OWNER) & (state.vertex_harbor != HARBOR_NONE)
+    block[owners[on_port], 2 + state.vertex_harbor[on_port]] = 1.0
 
+    # Production per resource (normalized: max ~15 pips)
+    prod = _player_production(state)
+    block[:, _PRODUCTION_SLICE] = np.minimum(prod / 15, 1.0)
 
-def _player_resource_production(state: CatanState, player: int) -> dict[str, float]:
+    # Resource diversity (0-5 normalized)
+    block[:, 13] = np.count_nonzero(prod, axis=1) / 5  # prod >= 0
+
+    state._feature_cache = (key, block)
+    return block
+
+
+def _player_production(state: CatanState) -> np.ndarray:
     """
-    Calculate per-resource pip production for a player.
+    float64[player_count, 5] pip production per player and resource.
     Matches evaluation/board-analysis.ts playerResourceProduction.
+
+    Each hex contributes its pips once per adjacent settlement and twice per
+    adjacent city of the player; the robber hex and the desert produce nothing.
     """
-    topo = state.topology
-    assert topo is not None
-    prod = {r: 0.0 for r in ALL_RESOURCES}
-    for vid in range(topo.vertex_count):
-        b = state.vertex_buildings[vid]
-        if b is None or b[1] != player:
-            continue
-        multiplier = 2 if b[0] == "city" else 1
-        v_prod = _vertex_resource_production(state, vid)
-        for r in ALL_RESOURCES:
-            prod[r] += v_prod[r] * multiplier
-    return prod
-
-
-def _vertex_resource_production(state: CatanState, vertex: int) -> dict[str, float]:
-    """
-    Get per-resource pip production for a vertex.
-    Matches evaluation/board-analysis.ts vertexResourceProduction.
-    """
-    topo = state.topology
-    assert topo is not None
-    prod = {r: 0.0 for r in ALL_RESOURCES}
-    for hid in topo.vertex_adjacent_hexes[vertex]:
-        if hid == state.robber_hex:
-            continue
-        terrain = state.hex_terrains[hid]
-        res = TERRAIN_TO_RESOURCE.get(terrain)
-        if res is not None:
-            prod[res] += get_pip_count(state.hex_numbers[hid])
-    return prod
+    # [hex, resource] pips of each hex
+    res = state.hex_resource_ids
+    producing = np.flatnonzero(res >= 0)
+    hex_pips = np.zeros((len(res), len(ALL_RESOURCES)), dtype=np.float64)
+    hex_pips[producing, res[producing]] = _PIP_LUT[state.hex_numbers[producing]]
+    hex_pips[state.robber_hex] = 0.0
+
+    # [player, hex] building weight (settlement 1, city 2) around each hex
+    owned = state.vertex_building_owner == np.arange(state.player_count)[:, None]
+    weight = np.where(owned, state.vertex_building_type, 0)
+    hex_weight = weight[:, state.topology.hex_vertices_arr].sum(axis=2)
+    return hex_weight @ hex_pips
+
+
+def _player_resource_production(state: CatanState, player: int) -> dict[str, float]:
+    """Per-resource pip production for one player, keyed by resource name."""
+    prod = _player_production(state)[player]
+    return {r: float(prod[i]) for i, r in enumerate(ALL_RESOURCES)}
@@ -14,8 +14,12 @@ PolicyValueNet:
 
 from __future__ import annotations
 
+import copy
+import warnings
+
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 
 from feature_extractor import TOTAL_FEATURES
 
@@ -50,10 +54,11 @@ class CatanMLP(nn.Module):
         Returns:
             Value estimate of shape (batch, 1) or (1,), values in [-1, 1]
         """
-        x = torch.relu(self.fc1(x))
-        x = torch.relu(self.fc2(x))
-        x = torch.tanh(self.fc3(x))
-        return x
+        # F.linear skips the nn.Linear call overhead; ReLU runs in place on
+        # the fresh linear outputs (their backward needs only the inputs)
+        h = F.relu_(F.linear(x, self.fc1.weight, self.fc1.bias))
+        h = F.relu_(F.linear(h, self.fc2.weight, self.fc2.bias))
+        return torch.tanh(F.linear(h, self.fc3.weight, self.fc3.bias))
 
 
 class PolicyValueNet(nn.Module):
@@ -100,29 +105,45 @@ class PolicyValueNet(nn.Module):
                 - policy_logits: (batch, max_actions) raw logits
                 - value: (batch, 1) value estimates in [-1, 1]
         """
-        # Shared trunk
-        h = torch.relu(self.shared_fc1(x))
-        h = torch.relu(self.shared_fc2(h))
+        h = self._trunk(x)
 
         # Value head
-        value = torch.tanh(self.value_head(h))
+        value = torch.tanh(F.linear(h, self.value_head.weight, self.value_head.bias))
 
         # Policy head (raw logits, masking applied externally)
-        policy_logits = self.policy_head(h)
+        policy_logits = F.linear(h, self.policy_head.weight, self.policy_head.bias)
 
         return policy_logits, value
 
+    def _trunk(self, x: torch.Tensor) -> torch.Tensor:
+        """Shared trunk; see CatanMLP.forward for the F.linear / relu_ form."""
+        h = F.relu_(F.linear(x, self.shared_fc1.weight, self.shared_fc1.bias))
+        return F.relu_(F.linear(h, self.shared_fc2.weight, self.shared_fc2.bias))
+
     def get_value(self, x: torch.Tensor) -> torch.Tensor:
         """Get only the value estimate (for advantage computation)."""
-        h = torch.relu(self.shared_fc1(x))
-        h = torch.relu(self.shared_fc2(h))
-        return torch.tanh(self.value_head(h))
+        h = self._trunk(x)
+        return torch.tanh(F.linear(h, self.value_head.weight, self.value_head.bias))
 
     def get_policy(self, x: torch.Tensor) -> torch.Tensor:
         """Get only the policy logits."""
-        h = torch.relu(self.shared_fc1(x))
-        h = torch.relu(self.shared_fc2(h))
-        return self.policy_head(h)
+        return F.linear(self._trunk(x), self.policy_head.weight, self.policy_head.bias)
+
+    def to_inference(
+        self,
+        dtype: torch.dtype = torch.bfloat16,
+        device: torch.device | str | None = None,
+    ) -> "PolicyValueNet":
+        """
+        Detached eval-mode copy cast to *dtype* (and moved to *device*).
+
+        Half precision halves the weight traffic; inputs must be cast to the
+        same dtype.  The training model is left untouched.
+        """
+        model = copy.deepcopy(self).to(device=device, dtype=dtype)
+        model.eval()
+        model.requires_grad_(False)
+        return model
 
     def extract_value_weights(self) -> dict[str, torch.Tensor]:
         """
@@ -140,3 +161,21 @@ class PolicyValueNet(nn.Module):
             "fc3.weight": self.value_head.weight.data.clone(),
             "fc3.bias": self.value_head.bias.data.clone(),
         }
+
+
+def compile_for_inference(model: torch.nn.Module) -> torch.nn.Module:
+    """Return *model* scripted and frozen with TorchScript, for faster eval.
+
+    Freezing folds the weights into the graph, which roughly halves the
+    per-call dispatch cost of the small MLP.  Falls back to the eager model
+    if scripting fails.  *model* must already be in eval mode.
+    """
+    try:
+        with warnings.catch_warnings():
+            # TorchScript is deprecated upstream but still the cheapest
+            # option for variable batch sizes on CPU.
+            warnings.simplefilter("ignore", FutureWarning)
+            return torch.jit.freeze(torch.jit.script(model))
+    except Exception as exc:  # pragma: no cover - depends on torch build
+        print(f"TorchScript compile failed ({exc}); using eager model")
+        return model
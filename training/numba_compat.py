@@ -0,0 +1,29 @@
+"""
+Optional Numba support.
+
+Numba is not a hard requirement of the training pipeline.  Hot loops are
+written as plain NumPy-array functions decorated with ``njit``; when Numba
+is installed they are JIT-compiled, otherwise ``njit`` is a no-op and
+callers should prefer their pure-Python paths (check ``HAS_NUMBA``).
+"""
+
+from __future__ import annotations
+
+try:
+    from numba import njit as _numba_njit
+    HAS_NUMBA = True
+except ImportError:  # pragma: no cover - depends on the environment
+    _numba_njit = None
+    HAS_NUMBA = False
+
+
+def njit(*args, **kwargs):
+    """``numba.njit`` if available, otherwise an identity decorator.
+
+    Supports both ``@njit`` and ``@njit(cache=True, ...)`` forms.
+    """
+    if HAS_NUMBA:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda fn: fn
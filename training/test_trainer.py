@@ -0,0 +1,112 @@
+"""
+Tests for the PPO update. Run from training/ with ``python -m pytest``.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+
+import numpy as np
+import pytest
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from torch.nn.parallel import DistributedDataParallel
+
+import trainer
+from feature_extractor import TOTAL_FEATURES
+from model import INPUT_SIZE, PolicyValueNet
+from trainer import PPOConfig, RolloutBuffer, _make_optimizer, ppo_update
+
+MAX_ACTIONS = 8
+
+
+def _filled_buffer(n: int, seed: int) -> tuple[RolloutBuffer, np.ndarray, np.ndarray]:
+    """A buffer of *n* random transitions with matching returns and advantages."""
+    rng = np.random.default_rng(seed)
+    buffer = RolloutBuffer(capacity=n)
+    for _ in range(n):
+        num_legal = int(rng.integers(1, MAX_ACTIONS + 1))
+        buffer.add(
+            rng.random(TOTAL_FEATURES, dtype=np.float32),
+            int(rng.integers(num_legal)), float(-np.log(num_legal)),
+            float(rng.standard_normal()), num_legal,
+        )
+    return buffer, rng.standard_normal(n), rng.standard_normal(n)
+
+
+def _count_steps(optimizer: torch.optim.Optimizer) -> list[int]:
+    steps = [0]
+    step = optimizer.step
+
+    def counted(*args, **kwargs):
+        steps[0] += 1
+        return step(*args, **kwargs)
+
+    optimizer.step = counted
+    return steps
+
+
+def test_short_rank_takes_every_step_without_nan(monkeypatch):
+    # This rank holds 5 transitions (2 batches of 4); pretend another rank
+    # needs 8 batches, more than there are transitions here
+    def all_reduce(tensor, op=None):
+        tensor.fill_(8)
+
+    monkeypatch.setattr(trainer.dist, "is_available", lambda: True)
+    monkeypatch.setattr(trainer.dist, "is_initialized", lambda: True)
+    monkeypatch.setattr(trainer.dist, "all_reduce", all_reduce)
+
+    torch.manual_seed(0)
+    config = PPOConfig(batch_size=4, ppo_epochs=2, max_actions=MAX_ACTIONS)
+    model = PolicyValueNet(input_size=INPUT_SIZE, max_actions=MAX_ACTIONS)
+    optimizer = _make_optimizer(model, config.lr)
+    steps = _count_steps(optimizer)
+    buffer, returns, advantages = _filled_buffer(5, seed=0)
+
+    metrics = ppo_update(
+        model, optimizer, buffer, returns, advantages, config, torch.device("cpu")
+    )
+
+    assert steps[0] == config.ppo_epochs * 8
+    assert all(np.isfinite(value) for value in metrics.values())
+    assert all(torch.isfinite(p).all() for p in model.parameters())
+
+
+def _uneven_ranks_worker(rank: int, world_size: int, init_file: str, sizes: list[int]) -> None:
+    dist.init_process_group(
+        "gloo", init_method=f"file://{init_file}", rank=rank, world_size=world_size
+    )
+    try:
+        torch.manual_seed(0)  # DDP broadcasts rank 0's weights anyway
+        config = PPOConfig(batch_size=4, ppo_epochs=1, max_actions=MAX_ACTIONS)
+        model = PolicyValueNet(input_size=INPUT_SIZE, max_actions=MAX_ACTIONS)
+        ddp_model = DistributedDataParallel(model)
+        optimizer = _make_optimizer(model, config.lr)
+        buffer, returns, advantages = _filled_buffer(sizes[rank], seed=rank)
+
+        ppo_update(
+            ddp_model, optimizer, buffer, returns, advantages, config,
+            torch.device("cpu"),
+        )
+
+        params = torch.cat([p.detach().flatten() for p in model.parameters()])
+        assert torch.isfinite(params).all()
+        # Identical weights on every rank: they took the same averaged steps
+        gathered = [torch.empty_like(params) for _ in range(world_size)]
+        dist.all_gather(gathered, params)
+        assert all(torch.equal(gathered[0], p) for p in gathered)
+    finally:
+        dist.destroy_process_group()
+
+
+@pytest.mark.skipif(not dist.is_available(), reason="torch.distributed unavailable")
+def test_uneven_ranks_stay_in_sync():
+    # 3 transitions on rank 0 against 40 (10 batches) on rank 1
+    with tempfile.TemporaryDirectory() as tmp:
+        mp.spawn(
+            _uneven_ranks_worker,
+            args=(2, os.path.join(tmp, "rendezvous"), [3, 40]),
+            nprocs=2,
+        )